@@ -14,6 +14,26 @@ import type { PageState, WsMessageData } from '../types';
 import { useGameWebSocket } from '../hooks/useGameWebSocket';
 import { saveUserId, getUserId, clearUserId } from '../utils/storage';
 
+// The rejoin ack shares its frame with the user list and, mid-game, the message for the page
+// to resume on. A page mounted by the ack never sees that frame, so pick the page from it here.
+const rejoinPage = (user: string, room: string, frame: WsMessageData[]): PageState => {
+  let page: PageState = { page: 'waiting', user, room };
+  for (const msg of frame) {
+    switch (msg.type) {
+      case 'user_update':
+        page = { ...page, users: msg.users };
+        break;
+      case 'ask_prompt':
+        return { page: 'prompt', user, room, prompt: msg.prompt, already_answered: msg.already_answered || false };
+      case 'ask_vote':
+        return { page: 'vote', user, room, prompt: msg.prompt, answers: msg.answers, already_voted: msg.voted || false };
+      case 'show_results':
+        return { page: 'results', user, room, results: msg.results, prompt: "" };
+    }
+  }
+  return page;
+};
+
 const GameApp: React.FC = () => {
   const [curPage, setCurPage] = useState<PageState>({ page: "login" });
   const [theme, setTheme] = useState<ThemeColors>(gameshowTheme);
@@ -46,14 +66,18 @@ const GameApp: React.FC = () => {
     }
   }, [navigate, roomId]);
 
-  const handleMessage = useCallback((data: WsMessageData) => {
+  const handleMessage = useCallback((data: WsMessageData, frame: WsMessageData[]) => {
     switch (data.type) {
       case 'join_room_ok':
-      case 'rejoin_room_ok':
         if (data.user && data.room) {
           setPageWithRouting({ page: 'waiting', user: data.user, room: data.room });
         }
         break;
+      case 'rejoin_room_ok':
+        if (data.user && data.room) {
+          setPageWithRouting(rejoinPage(data.user, data.room, frame));
+        }
+        break;
       case 'error':
         console.log('Got error');
         clearUserId();
@@ -153,6 +177,7 @@ const GameApp: React.FC = () => {
             setCurPage={setPageWithRouting}
             user={curPage.user}
             room={curPage.room}
+            users={curPage.users}
           />;
         }
         return <div>Loading waiting room...</div>;
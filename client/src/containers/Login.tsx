@@ -10,10 +10,12 @@ import type {
   JoinRoomClientMessage, 
   CreateRoomClientMessage,
   JoinRoomSuccessServerMessage,
+  UserUpdateServerMessage,
   ErrorServerMessage
 } from '../generated/sockets_types';
 import useWebSocket from "react-use-websocket";
 import { WS_URL } from "../const";
+import { parseServerMessages } from "../utils/messages";
 
 interface LoginProps {
   setCurPage: (newPage: PageState) => void;
@@ -34,24 +36,35 @@ const Login: React.FC<LoginProps> = (props) => {
   useEffect(() => {
     if (lastMessage !== null) {
       try {
-        const data = JSON.parse(lastMessage.data as string) as (JoinRoomSuccessServerMessage | ErrorServerMessage);
-        // console.log("Login component received message:", data);
-
-        if (data.type === "join_room_ok") {
-          if (data.user && data.room) {
-            props.setCurPage({
-              page: "waiting",
-              user: data.user,
-              room: data.room
-            });
-          } else {
-            setError("Login successful, but user/room data missing. Please try again.");
+        const messages = parseServerMessages(lastMessage.data as string) as (JoinRoomSuccessServerMessage | UserUpdateServerMessage | ErrorServerMessage)[];
+        // The server sends the room's user list in the same frame as join_room_ok;
+        // hand it to the waiting page, which mounts too late to see this frame itself
+        let users: string[] | undefined;
+        for (const data of messages) {
+          if (data.type === "user_update") {
+            users = data.users;
+          }
+        }
+        for (const data of messages) {
+          // console.log("Login component received message:", data);
+
+          if (data.type === "join_room_ok") {
+            if (data.user && data.room) {
+              props.setCurPage({
+                page: "waiting",
+                user: data.user,
+                room: data.room,
+                users
+              });
+            } else {
+              setError("Login successful, but user/room data missing. Please try again.");
+              setShowError(true);
+              console.error("Success message missing user/room:", data);
+            }
+          } else if (data.type === 'error') {
+            setError(data.message || "An unknown error occurred");
             setShowError(true);
-            console.error("Success message missing user/room:", data);
           }
-        } else if (data.type === 'error') {
-          setError(data.message || "An unknown error occurred");
-          setShowError(true);
         }
       } catch (e) {
         console.error("Failed to parse WebSocket message in Login:", e, lastMessage.data);
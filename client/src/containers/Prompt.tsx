@@ -14,6 +14,7 @@ import type {
 } from "../generated/sockets_types";
 import useWebSocket from "react-use-websocket";
 import { WS_URL } from "../const";
+import { parseServerMessages } from "../utils/messages";
 
 interface PromptProps {
   setCurPage: (newPage: PageState) => void;
@@ -41,24 +42,25 @@ const Prompt: React.FC<PromptProps> = (props) => {
   useEffect(() => {
     if (lastMessage !== null) {
       try {
-        const data = JSON.parse(lastMessage.data as string) as (ErrorServerMessage | AskVoteServerMessage | AskPromptServerMessage);
-
-        if (data.type === "error") {
-          setError(data.message || "An unexpected error occurred.");
-          setShowError(true);
-          setWaiting(false); // Re-enable form if submission caused an error
-        } else if (data.type === "ask_vote") {
-          props.setCurPage({
-            page: "vote",
-            user: props.user,
-            room: props.room,
-            prompt: props.prompt,
-            answers: data.answers
-          });
-        } else if (data.type === "ask_prompt") {
-          // Handle rejoin sync - if already_answered is true, show the answered state
-          if (data.already_answered) {
-            setanswered(true);
+        for (const data of parseServerMessages(lastMessage.data as string) as (ErrorServerMessage | AskVoteServerMessage | AskPromptServerMessage)[]) {
+
+          if (data.type === "error") {
+            setError(data.message || "An unexpected error occurred.");
+            setShowError(true);
+            setWaiting(false); // Re-enable form if submission caused an error
+          } else if (data.type === "ask_vote") {
+            props.setCurPage({
+              page: "vote",
+              user: props.user,
+              room: props.room,
+              prompt: props.prompt,
+              answers: data.answers
+            });
+          } else if (data.type === "ask_prompt") {
+            // Handle rejoin sync - if already_answered is true, show the answered state
+            if (data.already_answered) {
+              setanswered(true);
+            }
           }
         }
       } catch (e) {
@@ -86,8 +88,6 @@ const Prompt: React.FC<PromptProps> = (props) => {
     setWaiting(true);
     const message: SubmitAnswerClientMessage = {
       type: "submit_answer",
-      room: props.room,
-      user: props.user,
       answer: answer.trim()
     };
     sendMessage(JSON.stringify(message));
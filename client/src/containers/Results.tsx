@@ -6,6 +6,7 @@ import { gameshowTheme } from '../theme/theme';
 import Toast from "../components/Toast";
 import useWebSocket from "react-use-websocket";
 import { WS_URL } from "../const";
+import { parseServerMessages } from "../utils/messages";
 import type { PageState } from "../types";
 import type { 
   ResultDetail,
@@ -53,30 +54,31 @@ const Results: React.FC<ResultsProps> = (props) => {
   useEffect(() => {
     if (lastMessage !== null) {
       try {
-        const data = JSON.parse(lastMessage.data as string) as (ErrorServerMessage | AskPromptServerMessage | GameDoneServerMessage);
-
-        if (props.room && props.room !== props.room) {
-          // console.log(`Results: Message for room ${data.room}, current room ${props.room}. Ignoring.`);
-          return;
-        }
-
-        if (data.type === "error") {
-          setError(data.message || "An unexpected error occurred from the server.");
-          setShowError(true);
-        } else if (data.type === "ask_prompt") {
-          props.setCurPage({
-            page: "prompt",
-            user: props.user,
-            room: props.room,
-            prompt: data.prompt
-          });
-        } else if (data.type === 'game_done') {
-          console.log("Results: Game done message received.");
-          setGameOver(true);
+        for (const data of parseServerMessages(lastMessage.data as string) as (ErrorServerMessage | AskPromptServerMessage | GameDoneServerMessage)[]) {
+
+          if (props.room && props.room !== props.room) {
+            // console.log(`Results: Message for room ${data.room}, current room ${props.room}. Ignoring.`);
+            return;
+          }
+
+          if (data.type === "error") {
+            setError(data.message || "An unexpected error occurred from the server.");
+            setShowError(true);
+          } else if (data.type === "ask_prompt") {
+            props.setCurPage({
+              page: "prompt",
+              user: props.user,
+              room: props.room,
+              prompt: data.prompt
+            });
+          } else if (data.type === 'game_done') {
+            console.log("Results: Game done message received.");
+            setGameOver(true);
+          }
+          // else {
+          //   console.warn("Results: Unhandled message type:", data.type);
+          // }
         }
-        // else {
-        //   console.warn("Results: Unhandled message type:", data.type);
-        // }
       } catch (e) {
         console.error(
           "Results: Failed to parse WebSocket message:",
@@ -13,6 +13,7 @@ import type {
 } from "../generated/sockets_types";
 import useWebSocket from "react-use-websocket";
 import { WS_URL } from "../const";
+import { parseServerMessages } from "../utils/messages";
 
 interface VoteProps {
   setCurPage: (newPage: PageState) => void;
@@ -39,31 +40,32 @@ const Vote: React.FC<VoteProps> = (props) => {
   useEffect(() => {
     if (lastMessage !== null) {
       try {
-        const data = JSON.parse(lastMessage.data as string) as (ErrorServerMessage | ShowResultsServerMessage);
-        // console.log('Vote received message:', data);
-
-        // Optional: Add room check if your backend might send messages for other rooms
-        if (props.room && props.room !== props.room) {
-          return;
-        }
-
-        if (data.type === "error") {
-          setError(data.message || "An unexpected error occurred.");
-          setShowError(true);
-          setWaiting(false); // Re-enable buttons if vote submission caused an error
-        } else if (data.type === "show_results") {
-          console.log("need to show the results")
-          // Ensure this is the correct type for ShowResultsMessageData
-          props.setCurPage({
-            page: "results",
-            user: props.user,
-            room: props.room,
-            results: data.results,
-            prompt: props.prompt, // Pass the current prompt to the results page
-          });
+        for (const data of parseServerMessages(lastMessage.data as string) as (ErrorServerMessage | ShowResultsServerMessage)[]) {
+          // console.log('Vote received message:', data);
+
+          // Optional: Add room check if your backend might send messages for other rooms
+          if (props.room && props.room !== props.room) {
+            return;
+          }
+
+          if (data.type === "error") {
+            setError(data.message || "An unexpected error occurred.");
+            setShowError(true);
+            setWaiting(false); // Re-enable buttons if vote submission caused an error
+          } else if (data.type === "show_results") {
+            console.log("need to show the results")
+            // Ensure this is the correct type for ShowResultsMessageData
+            props.setCurPage({
+              page: "results",
+              user: props.user,
+              room: props.room,
+              results: data.results,
+              prompt: props.prompt, // Pass the current prompt to the results page
+            });
+          }
+          // Else: unhandled message type for Vote component specifically
+          // console.warn("Unhandled message type in Vote:", data.type);
         }
-        // Else: unhandled message type for Vote component specifically
-        // console.warn("Unhandled message type in Vote:", data.type);
       } catch (e) {
         console.error(
           "Failed to parse WebSocket message in Vote:",
@@ -84,8 +86,6 @@ const Vote: React.FC<VoteProps> = (props) => {
     setWaiting(true);
     const message: SubmitVoteClientMessage = {
       type: "submit_vote",
-      room: props.room,
-      user: props.user,
       voted_for_answer_id: id
     };
     sendMessage(JSON.stringify(message));
@@ -15,15 +15,17 @@ import type {
 } from '../generated/sockets_types';
 import useWebSocket from "react-use-websocket";
 import { WS_URL } from "../const";
+import { parseServerMessages } from "../utils/messages";
 
 interface WaitingProps {
   setCurPage: (newPage: PageState) => void;
   user: string;
   room: string;
+  users?: string[]; // User list delivered alongside the join ack, if any
 }
 
 const Waiting: React.FC<WaitingProps> = (props) => {
-  const [users, setUsers] = useState<string[]>([]);
+  const [users, setUsers] = useState<string[]>(props.users ?? []);
   const [error, setError] = useState<string>("");
   const [showError, setShowError] = useState<boolean>(false);
   const theme = useTheme();
@@ -43,56 +45,56 @@ const Waiting: React.FC<WaitingProps> = (props) => {
   useEffect(() => {
     if (lastMessage !== null) {
       try {
-        const data = JSON.parse(lastMessage.data as string) as (UserUpdateServerMessage | ErrorServerMessage | AskPromptServerMessage | AskVoteServerMessage | ShowResultsServerMessage);
-        // console.log('Waiting received message:', data);
-
-        if (data.type === 'user_update') {
-          // Ensure the message is for the current room if your backend supports multiple rooms per connection
-          // if (data.room === props.room) {
-          setUsers(data.users || []);
-          // }
-        } else if (data.type === 'error') {
-          // Optionally, check if error is relevant to this room/context
-          // if (data.room === props.room || !data.room) {
-          setError(data.message || "An error occurred");
-          setShowError(true);
-          // }
-        } else if (data.type === "ask_prompt") {
-          // If a message contains a 'prompt', transition to the prompt page
-          // This follows the logic from your original 'else' block.
-          // Ensure this message is intended for the current room.
-          // if (data.room === props.room) {
+        for (const data of parseServerMessages(lastMessage.data as string) as (UserUpdateServerMessage | ErrorServerMessage | AskPromptServerMessage | AskVoteServerMessage | ShowResultsServerMessage)[]) {
+          // console.log('Waiting received message:', data);
+
+          if (data.type === 'user_update') {
+            // Ensure the message is for the current room if your backend supports multiple rooms per connection
+            // if (data.room === props.room) {
+            setUsers(data.users || []);
+            // }
+          } else if (data.type === 'error') {
+            // Optionally, check if error is relevant to this room/context
+            // if (data.room === props.room || !data.room) {
+            setError(data.message || "An error occurred");
+            setShowError(true);
+            // }
+          } else if (data.type === "ask_prompt") {
+            // If a message contains a 'prompt', transition to the prompt page
+            // This follows the logic from your original 'else' block.
+            // Ensure this message is intended for the current room.
+            // if (data.room === props.room) {
+              props.setCurPage({
+                page: "prompt",
+                user: props.user,
+                room: props.room,
+                prompt: data.prompt,
+                already_answered: data.already_answered || false,
+              });
+            // }
+          } else if (data.type === "ask_vote") {
+            // Handle rejoin during voting phase - transition to vote page
             props.setCurPage({
-              page: "prompt",
+              page: "vote",
               user: props.user,
               room: props.room,
               prompt: data.prompt,
-              already_answered: data.already_answered || false,
+              answers: data.answers,
+              already_voted: data.voted || false,
             });
-          // }
-        } else if (data.type === "ask_vote") {
-          // Handle rejoin during voting phase - transition to vote page
-          props.setCurPage({
-            page: "vote",
-            user: props.user,
-            room: props.room,
-            prompt: data.prompt,
-            answers: data.answers,
-            already_voted: data.voted || false,
-          });
-        } else if (data.type === "show_results") {
-          // Handle rejoin during results phase - transition to results page
-          props.setCurPage({
-            page: "results",
-            user: props.user,
-            room: props.room,
-            results: data.results,
-            prompt: "" // Results page might need prompt, but it's not in show_results message
-          });
+          } else if (data.type === "show_results") {
+            // Handle rejoin during results phase - transition to results page
+            props.setCurPage({
+              page: "results",
+              user: props.user,
+              room: props.room,
+              results: data.results,
+              prompt: "" // Results page might need prompt, but it's not in show_results message
+            });
+          }
+          // Else: unhandled message type for Waiting component specifically
+          // console.warn("Unhandled message type in Waiting or already handled by App.tsx:", data.type);
         }
-        // Else: unhandled message type for Waiting component specifically
-        // console.warn("Unhandled message type in Waiting or already handled by App.tsx:", data.type);
-
       } catch (e) {
         console.error("Failed to parse WebSocket message in Waiting:", e, lastMessage.data);
       }
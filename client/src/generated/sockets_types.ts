@@ -160,14 +160,6 @@ export interface StartRoomClientMessage {
 export interface SubmitAnswerClientMessage {
   request_id?: string | null;
   type?: "submit_answer";
-  /**
-   * ID of the room.
-   */
-  room: string;
-  /**
-   * User ID of the player submitting the answer.
-   */
-  user: string;
   /**
    * The text of the answer being submitted.
    */
@@ -176,14 +168,6 @@ export interface SubmitAnswerClientMessage {
 export interface SubmitVoteClientMessage {
   request_id?: string | null;
   type?: "submit_vote";
-  /**
-   * ID of the room.
-   */
-  room: string;
-  /**
-   * User ID of the player submitting the vote.
-   */
-  user: string;
   /**
    * The ID of the answer being voted for.
    */
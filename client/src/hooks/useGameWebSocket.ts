@@ -4,10 +4,12 @@ import { WS_URL } from '../const';
 import type { WsMessageData } from '../types';
 import type { ReJoinRoomClientMessage } from '../generated/sockets_types';
 import { getUserId } from '../utils/storage';
+import { parseServerMessages } from '../utils/messages';
 
 interface UseGameWebSocketProps {
   roomId: string | undefined;
-  onMessage: (data: WsMessageData) => void;
+  // Called once per message, in order, with every message of the frame it arrived in
+  onMessage: (data: WsMessageData, frame: WsMessageData[]) => void;
   onReconnect: () => void;
 }
 
@@ -57,8 +59,10 @@ export const useGameWebSocket = ({ roomId, onMessage, onReconnect }: UseGameWebS
   useEffect(() => {
     if (lastMessage !== null) {
       try {
-        const data: WsMessageData = JSON.parse(lastMessage.data as string);
-        onMessage(data);
+        const frame = parseServerMessages(lastMessage.data as string);
+        for (const data of frame) {
+          onMessage(data, frame);
+        }
       } catch (e) {
         console.error("Failed to parse WebSocket message:", e, lastMessage.data);
       }
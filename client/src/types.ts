@@ -16,6 +16,7 @@ export interface PageState {
   page: string;
   user?: string;
   room?: string;
+  users?: string[];
   prompt?: string;
   answers?: Answer[];
   results?: any;
@@ -0,0 +1,8 @@
+import type { WsMessageData } from '../types';
+
+// The server may put several messages in one frame as a JSON array
+// (e.g. join_room_ok followed by user_update); always return them in order.
+export const parseServerMessages = (raw: string): WsMessageData[] => {
+  const parsed = JSON.parse(raw) as WsMessageData | WsMessageData[];
+  return Array.isArray(parsed) ? parsed : [parsed];
+};
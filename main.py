@@ -1,18 +1,30 @@
 import asyncio
 import logging
+import logging.handlers
+import queue
 from splash_club.websocket_server import WebSocketServer
 
-def setup_logging():
-    """Configure logging for the application."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s %(levelname)s [%(name)s]: %(message)s',
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Configure logging for the application.
+    Records are queued and written by a background thread so slow stderr never blocks the event loop.
+    """
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        '%(asctime)s %(levelname)s [%(name)s]: %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    ))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
 
 async def main():
     """Main entry point for the WebSocket server."""
-    setup_logging()
+    listener = setup_logging()
     
     server = WebSocketServer(host="0.0.0.0", port=6969)
     
@@ -21,9 +33,19 @@ async def main():
     except KeyboardInterrupt:
         logging.info("Received shutdown signal")
     except Exception as e:
-        logging.exception(f"Server error: {e}")
+        logging.exception("Server error: %s", e)
     finally:
         await server.shutdown()
+        listener.stop()
+
+def run():
+    """Run the server on uvloop when it's installed, else the default asyncio loop."""
+    try:
+        import uvloop  # pyrefly: ignore[missing-import]
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run()
\ No newline at end of file
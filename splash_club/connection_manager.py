@@ -2,101 +2,249 @@
 
 import logging
 import asyncio
-from collections import defaultdict
-from typing import Dict, List, Optional
+from typing import Collection, Dict, List, NamedTuple, Optional, Sequence, Set, Union
 import websockets
-from splash_club.contracts import OutgoingMessage
+from splash_club.contracts import OutgoingMessage, UserUpdateServerMessage, serialize_outgoing
+
+logger = logging.getLogger(__name__)
+
+
+def _coalesce_frames(payloads: Sequence[bytes]) -> bytes:
+    """
+    Merge queued payloads into one JSON-array frame.
+    Payloads that are already arrays (batches) are spliced in, not nested;
+    empty batches add nothing, so they can't leave a stray comma.
+    """
+    return b"[" + b",".join([p[1:-1] if p[:1] == b"[" else p for p in payloads if p != b"[]"]) + b"]"
+
+
+class UserInfo(NamedTuple):
+    """The room and user a websocket is registered as."""
+    room_id: str
+    user_id: str
 
 
 class ConnectionManager:
     """Manages WebSocket connections and user-room relationships."""
+
+    # Max sends awaited together before yielding back to the event loop
+    BROADCAST_BATCH_SIZE = 50
+    # Frames a registered client may have queued before it's treated as too slow
+    OUTBOX_MAX_SIZE = 256
+    # Max queued frames the writer merges into a single websocket frame
+    OUTBOX_COALESCE_LIMIT = 16
     
     def __init__(self):
-        # ROOM_ID -> USER_ID -> WebSocket
-        self.users: Dict[str, Dict[str, websockets.ServerConnection]] = defaultdict(dict)
+        # ROOM_ID -> USER_ID -> WebSocket; a room's entry exists only while it has users
+        self.users: Dict[str, Dict[str, websockets.ServerConnection]] = {}
         # Map WebSocket back to user details for quick lookup
-        self.websocket_to_user_info: Dict[websockets.ServerConnection, Dict[str, str]] = {}
+        self.websocket_to_user_info: Dict[websockets.ServerConnection, UserInfo] = {}
+        # Registered WebSocket -> outbound queue drained by that socket's writer task
+        self._outboxes: Dict[websockets.ServerConnection, asyncio.Queue] = {}
+        self._writers: Dict[websockets.ServerConnection, asyncio.Task] = {}
+        # Background closes of too-slow clients; kept apart from _writers so unregistering never cancels them
+        self._closing: Set[asyncio.Task] = set()
+        # ROOM_ID -> user list and serialized user_update, rebuilt lazily after membership changes
+        self._room_user_list_cache: Dict[str, List[str]] = {}
+        self._user_update_frame_cache: Dict[str, bytes] = {}
+        # ROOM_ID -> users that already hold the current user list, for rooms awaiting a user_update flush
+        self._pending_user_updates: Dict[str, Set[str]] = {}
+        self._user_update_flush: Optional[asyncio.Task] = None
         
     async def register_user(self, websocket: websockets.ServerConnection, room_id: str, user_id: str) -> None:
         """Register a user's websocket connection to a room."""
-        self.users[room_id][user_id] = websocket
-        self.websocket_to_user_info[websocket] = {"room_id": room_id, "user_id": user_id}
-        logging.info(f"Registered user '{user_id}' to room '{room_id}' ({websocket.remote_address})")
+        self.users.setdefault(room_id, {})[user_id] = websocket
+        self.websocket_to_user_info[websocket] = UserInfo(room_id, user_id)
+        self._invalidate_room_cache(room_id)
+        if websocket not in self._outboxes:
+            outbox: asyncio.Queue = asyncio.Queue(maxsize=self.OUTBOX_MAX_SIZE)
+            self._outboxes[websocket] = outbox
+            self._writers[websocket] = asyncio.create_task(self._writer(websocket, outbox))
+        logger.info("Registered user '%s' to room '%s' (%s)", user_id, room_id, websocket.remote_address)
         
     async def unregister_user(self, websocket: websockets.ServerConnection) -> Optional[str]:
         """Remove a user from tracking and return their room_id if they were in one."""
+        self._outboxes.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None:
+            writer.cancel()
         user_info = self.websocket_to_user_info.pop(websocket, None)
         if user_info:
-            room_id = user_info["room_id"]
-            user_id = user_info["user_id"]
-            logging.info(f"Unregistering user '{user_id}' from room '{room_id}' ({websocket.remote_address})")
+            room_id, user_id = user_info
+            logger.info("Unregistering user '%s' from room '%s' (%s)", user_id, room_id, websocket.remote_address)
             
-            if room_id in self.users and user_id in self.users[room_id]:
-                del self.users[room_id][user_id]
-                if not self.users[room_id]:  # Room is empty
+            # Reverse index gives us the room directly, so this is O(1) per disconnect
+            room_users = self.users.get(room_id)
+            if room_users is not None and room_users.pop(user_id, None) is not None:
+                self._invalidate_room_cache(room_id)
+                if not room_users:  # Room is empty
                     del self.users[room_id]
-                    logging.info(f"Removed empty room '{room_id}'")
+                    logger.info("Removed empty room '%s'", room_id)
                     return None  # No need to notify if room is empty
                 else:
                     return room_id  # Return room_id so caller can notify remaining users
             else:
-                logging.warning(f"User '{user_id}' or room '{room_id}' not found during unregister")
+                logger.warning("User '%s' or room '%s' not found during unregister", user_id, room_id)
         else:
-            logging.debug(f"Websocket {websocket.remote_address} not found during unregister")
+            logger.debug("Websocket %s not found during unregister", websocket.remote_address)
         return None
         
-    def get_user_info(self, websocket: websockets.ServerConnection) -> Optional[Dict[str, str]]:
+    def get_user_info(self, websocket: websockets.ServerConnection) -> Optional[UserInfo]:
         """Get user info (room_id, user_id) for a websocket connection."""
         return self.websocket_to_user_info.get(websocket)
         
     def get_room_users(self, room_id: str) -> List[str]:
-        """Get list of user IDs in a room."""
-        return list(self.users.get(room_id, {}).keys())
+        """
+        Get list of user IDs in a room.
+        The list is cached until the room's membership changes, so callers must not mutate it.
+        """
+        users = self._room_user_list_cache.get(room_id)
+        if users is None:
+            users = list(self.users.get(room_id, {}))
+            if users:
+                self._room_user_list_cache[room_id] = users
+        return users
+        
+    def get_user_update_frame(self, room_id: str) -> bytes:
+        """Get the serialized user_update message for a room, cached alongside the user list."""
+        frame = self._user_update_frame_cache.get(room_id)
+        if frame is None:
+            users = self.get_room_users(room_id)
+            frame = serialize_outgoing(UserUpdateServerMessage.model_construct(users=users))
+            if users:
+                self._user_update_frame_cache[room_id] = frame
+        return frame
+        
+    def _invalidate_room_cache(self, room_id: str) -> None:
+        """Drop a room's cached user list and user_update frame after a membership change."""
+        self._room_user_list_cache.pop(room_id, None)
+        self._user_update_frame_cache.pop(room_id, None)
+        # Anyone who was sent the old list needs the new one in the pending flush
+        already_sent = self._pending_user_updates.get(room_id)
+        if already_sent:
+            already_sent.clear()
         
     def room_exists(self, room_id: str) -> bool:
         """Check if a room has any active connections."""
-        return room_id in self.users and bool(self.users[room_id])
+        # Empty rooms are removed on unregister, so membership alone is enough
+        return room_id in self.users
         
-    async def safe_websocket_send(self, websocket: websockets.ServerConnection, message_json: str) -> bool:
-        """Safely send a JSON message, return False if connection failed."""
+    async def _writer(self, websocket: websockets.ServerConnection, outbox: asyncio.Queue) -> None:
+        """Drain a client's outbox, merging whatever has piled up into one frame."""
+        try:
+            while True:
+                payloads = [await outbox.get()]
+                while len(payloads) < self.OUTBOX_COALESCE_LIMIT and not outbox.empty():
+                    payloads.append(outbox.get_nowait())
+                frame = payloads[0] if len(payloads) == 1 else _coalesce_frames(payloads)
+                await websocket.send(frame, text=True)
+        except websockets.exceptions.ConnectionClosed:
+            logger.debug("Connection closed for %s, stopping writer", websocket.remote_address)
+        except Exception as e:
+            logger.error("Unexpected error in writer for %s: %s", websocket.remote_address, e)
+        finally:
+            # A dead writer must not leave an outbox that accepts sends nobody will write
+            if self._outboxes.get(websocket) is outbox:
+                del self._outboxes[websocket]
+                self._writers.pop(websocket, None)
+            
+    async def safe_websocket_send(self, websocket: websockets.ServerConnection, message_json: Union[str, bytes]) -> bool:
+        """
+        Safely send a JSON message, return False if connection failed.
+        Registered clients get it queued for their writer task; anything else is sent directly.
+        """
+        outbox = self._outboxes.get(websocket)
+        if outbox is not None:
+            if isinstance(message_json, str):
+                message_json = message_json.encode()
+            try:
+                outbox.put_nowait(message_json)
+                return True
+            except asyncio.QueueFull:
+                # Never let one slow reader buffer unbounded memory; it can reconnect and rejoin.
+                # Close in the background so whoever is sending isn't held up by the handshake.
+                logger.warning("Outbox full for %s, closing connection", websocket.remote_address)
+                del self._outboxes[websocket]
+                self._writers.pop(websocket).cancel()
+                close_task = asyncio.create_task(websocket.close(code=1008, reason="Client too slow"))
+                self._closing.add(close_task)
+                close_task.add_done_callback(self._closing.discard)
+                return False
+        if websocket in self.websocket_to_user_info:
+            # Registered but its outbox was dropped: the connection is being closed as too slow
+            return False
+            
         try:
-            await websocket.send(message_json)
+            # Always a text frame; pre-encoded bytes are sent without re-encoding
+            await websocket.send(message_json, text=True)
             return True
         except websockets.exceptions.ConnectionClosed:
-            logging.debug(f"Connection closed for {websocket.remote_address} during send attempt")
+            logger.debug("Connection closed for %s during send attempt", websocket.remote_address)
             return False
         except Exception as e:
-            logging.error(f"Unexpected error sending to {websocket.remote_address}: {e}")
+            logger.error("Unexpected error sending to %s: %s", websocket.remote_address, e)
             return False
             
-    async def broadcast_to_room(self, room_id: str, message: OutgoingMessage) -> int:
+    async def broadcast_to_room(self, room_id: str, message: OutgoingMessage, exclude_user: Optional[str] = None) -> int:
         """
-        Broadcast a message to all users in a room.
+        Broadcast a message to all users in a room, optionally skipping one user.
         Returns the number of successful sends.
         """
         if not self.room_exists(room_id):
-            logging.warning(f"Attempted to broadcast to non-existent room: {room_id}")
+            logger.warning("Attempted to broadcast to non-existent room: %s", room_id)
             return 0
+        excluded = () if exclude_user is None else (exclude_user,)
+        return await self._broadcast_payload(room_id, serialize_outgoing(message), message.type, excluded)
+        
+    def queue_user_update(self, room_id: str, already_sent_to: Optional[str] = None) -> None:
+        """
+        Mark a room's user list as changed; one user_update goes out for it on the next loop tick.
+        Joins landing in the same tick share that broadcast. already_sent_to names a user who
+        was just sent the current list directly and can be skipped.
+        """
+        already_sent = self._pending_user_updates.setdefault(room_id, set())
+        if already_sent_to is not None:
+            already_sent.add(already_sent_to)
+        if self._user_update_flush is None:
+            self._user_update_flush = asyncio.create_task(self._flush_user_updates())
             
-        message_json = message.model_dump_json()
-        current_connections = list(self.users[room_id].items())
+    async def _flush_user_updates(self) -> None:
+        """Broadcast one user_update per room queued since the last flush."""
+        await asyncio.sleep(0)
+        # Swap before any await so rooms queued during the broadcasts start a fresh flush
+        pending, self._pending_user_updates = self._pending_user_updates, {}
+        self._user_update_flush = None
+        for room_id, already_sent in pending.items():
+            if self.room_exists(room_id):
+                await self._broadcast_payload(room_id, self.get_user_update_frame(room_id), "user_update", already_sent)
+        
+    async def _broadcast_payload(self, room_id: str, message_json: bytes, message_type: str, exclude_users: Collection[str] = ()) -> int:
+        """Send an already-serialized payload to every user in a room except exclude_users."""
+        # Snapshot only the sockets: the room can change while we yield between batches
+        room_users = self.users[room_id]
+        if not exclude_users:
+            current_connections = tuple(room_users.values())
+        else:
+            current_connections = tuple(ws for user_id, ws in room_users.items() if user_id not in exclude_users)
         
         if not current_connections:
-            logging.info(f"No active connections in room {room_id}")
+            logger.debug("No connections to send '%s' to in room %s", message_type, room_id)
             return 0
             
-        logging.info(f"Broadcasting to room '{room_id}' ({len(current_connections)} users): {message.type}")
-        
-        tasks = [
-            self.safe_websocket_send(ws, message_json)
-            for _, ws in current_connections
-        ]
-        results = await asyncio.gather(*tasks)
+        logger.debug("Broadcasting to room '%s' (%d users): %s", room_id, len(current_connections), message_type)
         
-        successful_sends = sum(1 for result in results if result)
-        failed_sends = len(results) - successful_sends
+        # Sends only enqueue onto each writer's outbox, so await them in turn rather than
+        # spinning up a task per user; still yield every batch so a big room can't starve the loop
+        successful_sends = 0
+        batch_size = self.BROADCAST_BATCH_SIZE
+        for i, ws in enumerate(current_connections):
+            if i and not i % batch_size:
+                await asyncio.sleep(0)
+            if await self.safe_websocket_send(ws, message_json):
+                successful_sends += 1
+        failed_sends = len(current_connections) - successful_sends
         
         if failed_sends > 0:
-            logging.warning(f"Failed to send to {failed_sends} users in room '{room_id}'")
+            logger.warning("Failed to send to %s users in room '%s'", failed_sends, room_id)
             
         return successful_sends
\ No newline at end of file
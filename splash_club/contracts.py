@@ -1,9 +1,7 @@
 # contracts.py
-import json
-import os
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Annotated, Any, Dict, List, Literal, Optional, Sequence, Type, Union
 
-from pydantic import BaseModel, Field, TypeAdapter
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 # --- Client to Server Messages ---
 
@@ -31,27 +29,27 @@ class StartRoomClientMessage(BaseClientMessage):
     room: str = Field(..., description="ID of the room to start.")
     # user: Optional[str] = None # User initiating start, could be inferred by server
 
+# Submits act on the room/user the connection joined as, so they don't repeat them
 class SubmitAnswerClientMessage(BaseClientMessage):
     type: Literal["submit_answer"] = "submit_answer"
-    room: str = Field(..., description="ID of the room.")
-    user: str = Field(..., description="User ID of the player submitting the answer.")
     answer: str = Field(..., description="The text of the answer being submitted.")
 
 class SubmitVoteClientMessage(BaseClientMessage):
     type: Literal["submit_vote"] = "submit_vote"
-    room: str = Field(..., description="ID of the room.")
-    user: str = Field(..., description="User ID of the player submitting the vote.")
     voted_for_answer_id: str = Field(..., description="The ID of the answer being voted for.")
 
 # Union of all possible messages from Client to Server
 # Pydantic will use the 'type' field to discriminate the union
-IncomingMessage = Union[
-    CreateRoomClientMessage,
-    JoinRoomClientMessage,
-    StartRoomClientMessage,
-    SubmitAnswerClientMessage,
-    SubmitVoteClientMessage,
-    ReJoinRoomClientMessage,
+IncomingMessage = Annotated[
+    Union[
+        CreateRoomClientMessage,
+        JoinRoomClientMessage,
+        StartRoomClientMessage,
+        SubmitAnswerClientMessage,
+        SubmitVoteClientMessage,
+        ReJoinRoomClientMessage,
+    ],
+    Field(discriminator="type"),
 ]
 
 # --- Server to Client Messages ---
@@ -91,6 +89,8 @@ class AskPromptServerMessage(BaseServerMessage):
     already_answered: Optional[bool] = Field(default=False, description="True if the player has already submitted an answer for this prompt.")
 
 class AnswerOptionForVote(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str = Field(..., description="Unique ID for this answer option.")
     text: str = Field(..., description="The text content of the answer option.")
 
@@ -101,6 +101,8 @@ class AskVoteServerMessage(BaseServerMessage):
     voted: bool = Field(default=False, description="True if the player has already voted for an answer.")
 
 class ResultDetail(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     user: str = Field(..., description="ID of the answer.")
     score: int = Field(..., description="Score user has totaled over the game")
     # submitter_user_id: Optional[str] = None # Could be included
@@ -116,27 +118,66 @@ class GameDoneServerMessage(BaseServerMessage):
 
 
 # Union of all possible messages from Server to Client
-OutgoingMessage = Union[
-    ErrorServerMessage,
-    JoinRoomSuccessServerMessage,
-    UserUpdateServerMessage,
-    AskPromptServerMessage,
-    AskVoteServerMessage,
-    ShowResultsServerMessage,
-    GameDoneServerMessage,
-    ReJoinRoomSuccessServerMessage,
-    RoomNotFoundServerMessage,
+OutgoingMessage = Annotated[
+    Union[
+        ErrorServerMessage,
+        JoinRoomSuccessServerMessage,
+        UserUpdateServerMessage,
+        AskPromptServerMessage,
+        AskVoteServerMessage,
+        ShowResultsServerMessage,
+        GameDoneServerMessage,
+        ReJoinRoomSuccessServerMessage,
+        RoomNotFoundServerMessage,
+    ],
+    Field(discriminator="type"),
 ]
 
 # --- HELPERS ----
 
-def parse_incoming_message(json_str: str) -> IncomingMessage:
-    """Parse incoming JSON message into appropriate Pydantic model."""
-    adapter = TypeAdapter(IncomingMessage)
-    return adapter.validate_json(json_str)
-
-def parse_outgoing_message(json_str: str) -> OutgoingMessage:
+# Building a TypeAdapter compiles the whole union's core schema, so do it once
+_INCOMING_ADAPTER: TypeAdapter[IncomingMessage] = TypeAdapter(IncomingMessage)
+_OUTGOING_ADAPTER: TypeAdapter[OutgoingMessage] = TypeAdapter(OutgoingMessage)
+_ANSWER_OPTIONS_ADAPTER: TypeAdapter[List[AnswerOptionForVote]] = TypeAdapter(List[AnswerOptionForVote])
+_RESULTS_ADAPTER: TypeAdapter[List[ResultDetail]] = TypeAdapter(List[ResultDetail])
+# Per-message-class adapters for serializing: skips the union dispatch on every send
+_SERIALIZER_CACHE: Dict[Type[BaseModel], TypeAdapter] = {}
+
+def parse_incoming_message(json_str: Union[str, bytes]) -> IncomingMessage:
+    """
+    Parse incoming JSON message into appropriate Pydantic model.
+    Accepts raw frame bytes so callers can skip decoding to str first.
+    """
+    return _INCOMING_ADAPTER.validate_json(json_str)
+
+def parse_outgoing_message(json_str: Union[str, bytes]) -> OutgoingMessage:
     """Parse outgoing JSON message into appropriate Pydantic model."""
-    adapter = TypeAdapter(OutgoingMessage)
-    return adapter.validate_json(json_str)
+    return _OUTGOING_ADAPTER.validate_json(json_str)
+
+def validate_answer_options(answers: List[Dict[str, Any]]) -> List[AnswerOptionForVote]:
+    """Validate a list of answer dicts into AnswerOptionForVote models in one call."""
+    return _ANSWER_OPTIONS_ADAPTER.validate_python(answers)
+
+def validate_results(results: List[Dict[str, Any]]) -> List[ResultDetail]:
+    """Validate a list of result dicts into ResultDetail models in one call."""
+    return _RESULTS_ADAPTER.validate_python(results)
+
+def serialize_outgoing(message: OutgoingMessage) -> bytes:
+    """
+    Serialize an outgoing message to UTF-8 JSON bytes ready for the websocket.
+    Unset optional fields (e.g. response_to_request_id on broadcasts) are left out
+    to keep frames small; the client treats them as optional.
+    """
+    adapter = _SERIALIZER_CACHE.get(type(message))
+    if adapter is None:
+        adapter = _SERIALIZER_CACHE[type(message)] = TypeAdapter(type(message))
+    return adapter.dump_json(message, exclude_none=True)
+
+def serialize_batch(messages: Sequence[Union[OutgoingMessage, bytes]]) -> bytes:
+    """
+    Serialize several outgoing messages into one frame as a JSON array.
+    Items may also be single messages already serialized with serialize_outgoing.
+    The client handles the array's messages in order.
+    """
+    return b"[" + b",".join([m if isinstance(m, bytes) else serialize_outgoing(m) for m in messages]) + b"]"
 
@@ -2,11 +2,11 @@
 
 
 import random
+import secrets
 import string
 from enum import Enum, auto
 from abc import ABC, abstractmethod 
-import json
-import time 
+from collections import Counter
 
 from splash_club.contracts import (
     IncomingMessage, OutgoingMessage, # Base Union types
@@ -29,16 +29,17 @@ from typing import (
     Type
 )
 
+_ID_ALPHABET = string.ascii_uppercase
+
 def _random_id() -> str:
-    ascii = string.ascii_lowercase
-    return "".join(random.choices(ascii, k=GameGateway.NUM_ROOM_LETTERS)).upper()
+    # secrets.choice draws each letter uniformly from OS randomness
+    return "".join(secrets.choice(_ID_ALPHABET) for _ in range(GameGateway.NUM_ROOM_LETTERS))
 
-def _load_prompts() -> List[Tuple[str, str]]:
-    prompts: List[Tuple[str, str]] = []
+def _load_prompts() -> Tuple[Tuple[str, str], ...]:
     with open('splash_club/data/questions.txt') as fd:
-        for line in fd.readlines():
-            prompts.append(tuple(line.strip().split('\t')))
-    return prompts
+        # Stream the file and split once per line into an exact (prompt, answer) pair;
+        # the result is shared by every room, so freeze it
+        return tuple((q, a) for q, a in (line.rstrip('\n').split('\t', 1) for line in fd))
 
 class State(Enum):
     WAITING_TO_START = 'WAITING_TO_START'
@@ -74,25 +75,24 @@ class InteractReturnCodes(Enum):
 # Define specific return types for different game states
 GameStateData = Union[str, Dict[str, Any], List[Dict[str, Any]], Dict[str, str]]
 GameStateReturn = Tuple[InteractReturnCodes, State, GameStateData]
-
-class Player:
-    def __init__(self) -> None:
-        pass
+# (code, prompt, player -> that player's answer options in vote order)
+VoteOptionsReturn = Tuple[InteractReturnCodes, str, Dict[str, List[Dict[str, str]]]]
 
 class Room(ABC):
+    __slots__ = ('players',)
+
     def __init__(self) -> None:
-        self.players: Dict[str, Player] = {}
+        # Used as an insertion-ordered set; join order fixes each player's score slot
+        self.players: Dict[str, None] = {}
     
     def add_player(self, name: str) -> bool:
-        if name in self.players.keys():
+        if name in self.players:
             return False
-        self.players[name] = Player()
+        self.players[name] = None
         return True
 
     def rejoin_player(self, name: str) -> bool:
-        if name in self.players.keys():
-            return True
-        return False
+        return name in self.players
     
     @abstractmethod
     def start(self) -> StartReturnCodes:
@@ -106,6 +106,10 @@ class Room(ABC):
     def submit_data(self, player: str, data: Dict[str, Any]) -> InteractReturnCodes:
         pass
 
+    @abstractmethod
+    def get_vote_options(self) -> VoteOptionsReturn:
+        pass
+
 class GameGateway:
 
     NUM_ROOM_LETTERS = 4
@@ -114,9 +118,10 @@ class GameGateway:
         self.rooms: Dict[str, Room] = {}
 
     def room_start(self, room: str) -> StartReturnCodes:
-        if room not in self.rooms:
+        room_obj = self.rooms.get(room)
+        if room_obj is None:
             return StartReturnCodes.ROOM_NOT_FOUND
-        return self.rooms[room].start()
+        return room_obj.start()
 
     def new_game(self, room_class: Type[Room]) -> str:
         room = _random_id()
@@ -124,139 +129,182 @@ class GameGateway:
         return room
 
     def rejoin_room(self, room: str, name: str) -> JoinReturnCodes:
-        try:
-            if room not in self.rooms:
-                return JoinReturnCodes.ROOM_NOT_FOUND
-            success = self.rooms[room].rejoin_player(name)
-            if success:
-                return JoinReturnCodes.SUCCESS
-            else:
-                return JoinReturnCodes.NAME_IN_USE
-        except Exception:
+        room_obj = self.rooms.get(room)
+        if room_obj is None:
             return JoinReturnCodes.ROOM_NOT_FOUND
+        if room_obj.rejoin_player(name):
+            return JoinReturnCodes.SUCCESS
+        return JoinReturnCodes.NAME_IN_USE
 
     def join_room(self, room: str, name: str) -> JoinReturnCodes:
-        try:
-            if room not in self.rooms:
-                return JoinReturnCodes.ROOM_NOT_FOUND
-            success = self.rooms[room].add_player(name)
-            if success:
-                return JoinReturnCodes.SUCCESS
-            else:
-                return JoinReturnCodes.NAME_IN_USE
-        except Exception:
+        room_obj = self.rooms.get(room)
+        if room_obj is None:
             return JoinReturnCodes.ROOM_NOT_FOUND
+        if room_obj.add_player(name):
+            return JoinReturnCodes.SUCCESS
+        return JoinReturnCodes.NAME_IN_USE
 
     def get_room_state(self, room: str, name: Optional[str] = None) -> GameStateReturn:
-        if room in self.rooms:
-            if name is None or name in self.rooms[room].players:
-                return self.rooms[room].get_room_state(name)
-            else:
-                return (InteractReturnCodes.PLAYER_NOT_FOUND, State.UNKNOWN, {})
-        return (InteractReturnCodes.ROOM_NOT_FOUND, State.UNKNOWN, {})
+        room_obj = self.rooms.get(room)
+        if room_obj is None:
+            return (InteractReturnCodes.ROOM_NOT_FOUND, State.UNKNOWN, {})
+        if name is not None and name not in room_obj.players:
+            return (InteractReturnCodes.PLAYER_NOT_FOUND, State.UNKNOWN, {})
+        return room_obj.get_room_state(name)
 
     def submit_data(self, room: str, name: str, data: Dict[str, Any]) -> InteractReturnCodes:
-        if room in self.rooms:
-            if name in self.rooms[room].players:
-                return self.rooms[room].submit_data(name, data)
-            else:
-                return InteractReturnCodes.PLAYER_NOT_FOUND
-        return InteractReturnCodes.ROOM_NOT_FOUND
+        room_obj = self.rooms.get(room)
+        if room_obj is None:
+            return InteractReturnCodes.ROOM_NOT_FOUND
+        if name not in room_obj.players:
+            return InteractReturnCodes.PLAYER_NOT_FOUND
+        return room_obj.submit_data(name, data)
+
+    def get_vote_options(self, room: str) -> VoteOptionsReturn:
+        room_obj = self.rooms.get(room)
+        if room_obj is None:
+            return (InteractReturnCodes.ROOM_NOT_FOUND, "", {})
+        return room_obj.get_vote_options()
 
 class PromptRoom(Room):
 
     ROUNDS = 3 
     CORRECT_KEY = "~!~ø~!~"
     PROMPTS = _load_prompts()
+
+    __slots__ = (
+        '_prompt_indices', 'state', 'round', 'answers', 'votes',
+        '_player_index', '_score_vec', 'confirmed',
+        '_results', '_vote_options', '_prompt', '_answer',
+    )
   
     def __init__(self) -> None:
         super().__init__()
         
-        self.prompts = random.sample(PromptRoom.PROMPTS, PromptRoom.ROUNDS)
+        # PROMPTS is shared and never mutated, so each room only keeps indices into it
+        self._prompt_indices = random.sample(range(len(PromptRoom.PROMPTS)), PromptRoom.ROUNDS)
+        # Current round's (prompt, answer), rebound whenever the round advances
+        self._prompt, self._answer = PromptRoom.PROMPTS[self._prompt_indices[0]]
         self.state = State.WAITING_TO_START
         self.round = 0
         self.answers: Dict[str, str] = {}
         self.votes: Dict[str, str] = {}
-        self.vote_orders: Dict[str, List[str]] = {}
-        self.scores: Dict[str, int] = {}  # Fixed type hint
+        # Per-voter answer records in vote order, built once when voting starts
+        self._vote_options: Dict[str, List[Dict[str, str]]] = {}
+        # Scores live in a list indexed by each player's ordinal, fixed at start
+        self._player_index: Dict[str, int] = {}
+        self._score_vec: List[int] = []
         self.confirmed: Dict[str, bool] = {}
+        # Results for the current round, tallied once when voting closes
+        self._results: List[Dict[str, Any]] = []
 
     def start(self) -> StartReturnCodes:
-        if self.state != State.WAITING_TO_START:
+        if self.state is not State.WAITING_TO_START:
             return StartReturnCodes.ALREADY_STARTED
         if len(self.players) < 3:
             return StartReturnCodes.TOO_FEW_PLAYERS
         self.state = State.COLLECTING_ANSWERS
         # Initialize scores for all players
-        self.scores = {player: 0 for player in self.players.keys()}
+        self._player_index = {player: i for i, player in enumerate(self.players)}
+        self._score_vec = [0] * len(self._player_index)
         return StartReturnCodes.SUCCESS
 
+    @property
+    def scores(self) -> Dict[str, int]:
+        """Total score per player."""
+        return dict(zip(self._player_index, self._score_vec))
+
     def get_prompt(self) -> str:
-        return self.prompts[self.round][0]
+        return self._prompt
 
     def get_answers(self, user: str) -> List[Dict[str, str]]:  # Fixed method name typo
-        return [{'id': p, 'text': self.answers[p]} for p in self.vote_orders[user]]
+        return self._vote_options[user]
+
+    def get_vote_options(self) -> VoteOptionsReturn:
+        # Every voter's options in one call, for sending the whole room its ballots
+        if self.state is not State.VOTING:
+            return (InteractReturnCodes.WRONG_STATE, "", {})
+        return (InteractReturnCodes.SUCCESS, self._prompt, self._vote_options)
     
     def __start_voting(self) -> None:
         self.state = State.VOTING
-        self.answers[PromptRoom.CORRECT_KEY] = self.prompts[self.round][1]
+        self.answers[PromptRoom.CORRECT_KEY] = self._answer
+        # One record per answer, shared by every voter's list
+        records = {k: {'id': k, 'text': v} for k, v in self.answers.items()}
+        shuffle = random.shuffle
         for player in self.players:
-            other_players = [k for k in self.answers.keys() if k != player]
-            self.vote_orders[player] = random.sample(other_players, len(other_players))
+            options = [record for k, record in records.items() if k != player]
+            shuffle(options)
+            self._vote_options[player] = options
 
     def __show_results(self) -> None:
         self.state = State.SHOWING_RESULTS
-
-    def __votes_to_score(self) -> Dict[str, int]:
-        scores = {u: 0 for u in self.players}
-        # Count votes for each player
-        for voter, voted_for in self.votes.items():
-            if voted_for in self.players:
-                scores[voted_for] += 1
-                # Add to total scores
-                if voted_for in self.scores:
-                    self.scores[voted_for] += 1
-        return scores
+        self.__votes_to_score()
+        self._results = [{"user": user, "score": score} for user, score in zip(self._player_index, self._score_vec)]
+
+    def __votes_to_score(self) -> None:
+        score_vec = self._score_vec
+        player_index = self._player_index
+        # Count votes per answer in C, then credit the ones that belong to players
+        for voted_for, count in Counter(self.votes.values()).items():
+            idx = player_index.get(voted_for)
+            if idx is not None:
+                score_vec[idx] += count
 
     def __next_round(self) -> None:
         self.round += 1
         if self.round < PromptRoom.ROUNDS:
             self.state = State.COLLECTING_ANSWERS
+            self._prompt, self._answer = PromptRoom.PROMPTS[self._prompt_indices[self.round]]
             self.answers = {}
             self.votes = {}
-            self.vote_orders = {}
+            self._vote_options = {}
             self.confirmed = {}
+            self._results = []
         else:
             self.state = State.DONE
 
-    def submit_data(self, player: str, data: Dict[str, Any]) -> InteractReturnCodes:
-        try:
-            if self.state == State.COLLECTING_ANSWERS:
-                if 'answer' not in data:
-                    return InteractReturnCodes.INVALID_DATA
-                self.answers[player] = str(data['answer']).upper()
-                if len(self.answers) == len(self.players):
-                    self.__start_voting()
-            elif self.state == State.VOTING:
-                if 'voted_for_answer_id' not in data:
-                    return InteractReturnCodes.INVALID_DATA
-                vote = str(data['voted_for_answer_id'])
-                self.votes[player] = vote
-                if len(self.votes) == len(self.players):
-                    self.__show_results()
-            elif self.state == State.SHOWING_RESULTS:
-                time.sleep(2)
-                self.__next_round()
-            else:
-                return InteractReturnCodes.WRONG_STATE
-            return InteractReturnCodes.SUCCESS
-        except (KeyError, ValueError, TypeError):
+    def __on_answer(self, player: str, data: Dict[str, Any]) -> InteractReturnCodes:
+        answer = data.get('answer')
+        if not isinstance(answer, str):
             return InteractReturnCodes.INVALID_DATA
+        self.answers[player] = answer.upper()
+        # Players can still join mid-game, so compare against the live count
+        if len(self.answers) == len(self.players):
+            self.__start_voting()
+        return InteractReturnCodes.SUCCESS
+
+    def __on_vote(self, player: str, data: Dict[str, Any]) -> InteractReturnCodes:
+        vote = data.get('voted_for_answer_id')
+        if vote is None:
+            return InteractReturnCodes.INVALID_DATA
+        self.votes[player] = str(vote)
+        if len(self.votes) == len(self.players):
+            self.__show_results()
+        return InteractReturnCodes.SUCCESS
+
+    def __on_results_done(self, player: str, data: Dict[str, Any]) -> InteractReturnCodes:
+        self.__next_round()
+        return InteractReturnCodes.SUCCESS
+
+    # State -> submit handler; states missing here don't accept submissions
+    _SUBMIT_HANDLERS = {
+        State.COLLECTING_ANSWERS: __on_answer,
+        State.VOTING: __on_vote,
+        State.SHOWING_RESULTS: __on_results_done,
+    }
+
+    def submit_data(self, player: str, data: Dict[str, Any]) -> InteractReturnCodes:
+        handler = PromptRoom._SUBMIT_HANDLERS.get(self.state)
+        if handler is None:
+            return InteractReturnCodes.WRONG_STATE
+        # Handlers validate their own input, so no try/except is needed here
+        return handler(self, player, data)
 
     def get_room_state(self, player: Optional[str]) -> GameStateReturn:
         if self.round >= PromptRoom.ROUNDS:
             return (InteractReturnCodes.SUCCESS, self.state, {})
-        elif self.state == State.COLLECTING_ANSWERS:
+        elif self.state is State.COLLECTING_ANSWERS:
             # Include whether this specific player has already submitted an answer
             player_has_answered = player is not None and player in self.answers
             prompt_data = {
@@ -264,26 +312,20 @@ class PromptRoom(Room):
                 'player_has_answered': player_has_answered
             }
             return (InteractReturnCodes.SUCCESS, self.state, prompt_data)
-        elif self.state == State.WAITING_TO_START:
-            return (InteractReturnCodes.SUCCESS, self.state, {"players": list(self.players.keys())})
-        elif self.state == State.VOTING:
+        elif self.state is State.WAITING_TO_START:
+            return (InteractReturnCodes.SUCCESS, self.state, {"players": list(self.players)})
+        elif self.state is State.VOTING:
             if player is None:
                 return (InteractReturnCodes.PLAYER_NOT_FOUND, self.state, {})
             # Include whether this specific player has already voted
             player_has_voted = player in self.votes
-            print("PRINTING OUT VOTES", self.votes)
-            print("PRINTING OUT PLAYER", player)
-            print("PRINTING OUT PLAYER HAS VOTED", player_has_voted)
             answers_data = {
-                'prompt': self.prompts[self.round][0], 
+                'prompt': self.get_prompt(),
                 'answers': self.get_answers(player),
                 'player_has_voted': player_has_voted
             }
             return (InteractReturnCodes.SUCCESS, self.state, answers_data)
-        elif self.state == State.SHOWING_RESULTS:
-            print("PRINTING OUT RESULTS")
-            round_scores = self.__votes_to_score()
-            results = [{"user": user, "score": self.scores[user]} for user in self.scores]
-            return (InteractReturnCodes.SUCCESS, self.state, results)
+        elif self.state is State.SHOWING_RESULTS:
+            return (InteractReturnCodes.SUCCESS, self.state, self._results)
         else:
             return (InteractReturnCodes.WRONG_STATE, self.state, {})
\ No newline at end of file
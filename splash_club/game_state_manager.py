@@ -1,139 +1,158 @@
 # game_state_manager.py
 
-import json
 import logging
 import asyncio
-from typing import List
+from typing import Dict, List
 from pydantic import ValidationError
 from splash_club.contracts import (
     AskPromptServerMessage, AskVoteServerMessage, ShowResultsServerMessage,
-    GameDoneServerMessage, AnswerOptionForVote, ResultDetail
+    GameDoneServerMessage, ResultDetail, AnswerOptionForVote, serialize_outgoing
 )
-from splash_club.game import State
+from splash_club.game import State, InteractReturnCodes
 from splash_club.connection_manager import ConnectionManager
 from splash_club.game import GameGateway
 
+logger = logging.getLogger(__name__)
+
 
 class GameStateManager:
     """Manages game state transitions and sends appropriate messages to players."""
+
+    # How long players see the results before the next round starts
+    RESULTS_DISPLAY_SECONDS = 2
     
     def __init__(self, connection_manager: ConnectionManager, game_gateway: GameGateway):
         self.connection_manager = connection_manager
         self.game_gateway = game_gateway
+        # ROOM_ID -> pending next-round task; at most one per room
+        self._next_round_tasks: Dict[str, asyncio.Task] = {}
+        
+    def schedule_next_round(self, room_id: str) -> bool:
+        """
+        Run handle_next_round_logic for a room in the background.
+        Returns False if that room already has one pending, so repeat triggers don't pile up tasks.
+        """
+        task = self._next_round_tasks.get(room_id)
+        if task is not None and not task.done():
+            logger.debug("Next round already scheduled for room '%s'", room_id)
+            return False
+        task = asyncio.create_task(self.handle_next_round_logic(room_id))
+        self._next_round_tasks[room_id] = task
+        task.add_done_callback(lambda t: self._forget_next_round(room_id, t))
+        return True
+        
+    def _forget_next_round(self, room_id: str, task: asyncio.Task) -> None:
+        """Drop a finished next-round task unless a newer one has replaced it."""
+        if self._next_round_tasks.get(room_id) is task:
+            del self._next_round_tasks[room_id]
         
     async def handle_ask_prompt_for_room(self, room_id: str) -> None:
         """Send prompt message to all users in the room."""
         try:
-            game_state = self.game_gateway.get_room_state(room_id)
-            if not game_state:
-                logging.error(f"Could not get room state for room '{room_id}'")
+            ret_code, _, game_data = self.game_gateway.get_room_state(room_id)
+            if ret_code != InteractReturnCodes.SUCCESS:
+                logger.error("Could not get room state for room '%s': %s", room_id, ret_code)
                 return
                 
-            _, _, game_data = game_state
-            
-            # Handle the new dictionary format for COLLECTING_ANSWERS state
-            if isinstance(game_data, dict) and 'prompt' in game_data:
-                prompt_text = game_data['prompt']
-                prompt_msg = AskPromptServerMessage(prompt=prompt_text)
-                await self.connection_manager.broadcast_to_room(room_id, prompt_msg)
-                logging.info(f"Sent prompt to room '{room_id}': {prompt_text[:50]}...")
-            elif isinstance(game_data, str):
-                # Fallback for legacy string format (if any)
-                prompt_msg = AskPromptServerMessage(prompt=game_data)
-                await self.connection_manager.broadcast_to_room(room_id, prompt_msg)
-                logging.info(f"Sent prompt to room '{room_id}': {game_data[:50]}...")
-            else:
-                logging.error(f"Unexpected prompt format for room '{room_id}': {type(game_data)} - {game_data}")
+            # The room hands back its prompt dict directly, no decoding needed
+            if not isinstance(game_data, dict):
+                logger.error("Unexpected prompt format for room '%s': %s", room_id, type(game_data))
+                return
+            prompt_text = game_data['prompt']
+            prompt_msg = AskPromptServerMessage.model_construct(prompt=prompt_text)
+            await self.connection_manager.broadcast_to_room(room_id, prompt_msg)
+            logger.info("Sent prompt to room '%s': %s...", room_id, prompt_text[:50])
                 
+        except KeyError as e:
+            logger.error("Unexpected prompt data for room '%s': missing %s", room_id, e)
         except Exception as e:
-            logging.error(f"Error handling prompt for room '{room_id}': {e}")
+            logger.error("Error handling prompt for room '%s': %s", room_id, e)
             
     async def handle_ask_vote_for_room(self, room_id: str) -> None:
         """Send voting options to all users in the room."""
         if not self.connection_manager.room_exists(room_id):
-            logging.warning(f"Attempted to handle vote for non-existent room: {room_id}")
+            logger.warning("Attempted to handle vote for non-existent room: %s", room_id)
             return
             
         try:
+            # One gateway call covers every voter's options
+            ret_code, prompt_text, vote_options = self.game_gateway.get_vote_options(room_id)
+            if ret_code != InteractReturnCodes.SUCCESS:
+                logger.error("Could not get vote options for room '%s': %s", room_id, ret_code)
+                return
+                
             # Get current connections to avoid modification during iteration
             user_connections = list(self.connection_manager.users[room_id].items())
             
-            tasks = []
+            # Voters see the same answers in different orders, so build each option model once
+            option_models: Dict[str, AnswerOptionForVote] = {}
+            prepared = 0
+            successful_sends = 0
             for user_id, websocket in user_connections:
-                try:
-                    # Get user-specific game state (filters answers appropriately)
-                    game_state = self.game_gateway.get_room_state(room_id, user_id)
-                    if not game_state:
-                        logging.error(f"Could not get room state for user '{user_id}' in room '{room_id}'")
-                        continue
-                        
-                    _, _, game_data = game_state
-                    
-                    # Parse answers for voting
-                    answers_data = game_data.get('answers', [])
-                    prompt_text = game_data.get('prompt', '')
-                    
-                    valid_answers = [AnswerOptionForVote(**ans) for ans in answers_data]
-                    vote_msg = AskVoteServerMessage(prompt=prompt_text, answers=valid_answers)
-                    
-                    # Send to individual user (content might be user-specific)
-                    tasks.append(self.connection_manager.safe_websocket_send(websocket, vote_msg.model_dump_json()))
-                    
-                except (KeyError, ValidationError) as e:
-                    logging.error(f"Error preparing vote message for user '{user_id}' in room '{room_id}': {e}")
+                answers = vote_options.get(user_id)
+                if answers is None:
+                    logger.error("No vote options for user '%s' in room '%s'", user_id, room_id)
                     continue
                     
-            if tasks:
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                successful_sends = sum(1 for result in results if result is True)
-                logging.info(f"Sent vote options to {successful_sends}/{len(tasks)} users in room '{room_id}'")
+                valid_answers = []
+                for record in answers:
+                    option = option_models.get(record['id'])
+                    if option is None:
+                        option = option_models[record['id']] = AnswerOptionForVote.model_construct(id=record['id'], text=record['text'])
+                    valid_answers.append(option)
+                vote_msg = AskVoteServerMessage.model_construct(prompt=prompt_text, answers=valid_answers)
+                
+                # Send to individual user (content is user-specific); this only enqueues, so no task per user
+                prepared += 1
+                if await self.connection_manager.safe_websocket_send(websocket, serialize_outgoing(vote_msg)):
+                    successful_sends += 1
+                    
+            if prepared:
+                logger.info("Sent vote options to %s/%s users in room '%s'", successful_sends, prepared, room_id)
             else:
-                logging.warning(f"No valid vote messages prepared for room '{room_id}'")
+                logger.warning("No valid vote messages prepared for room '%s'", room_id)
                 
         except Exception as e:
-            logging.error(f"Error handling vote for room '{room_id}': {e}")
+            logger.error("Error handling vote for room '%s': %s", room_id, e)
             
     async def handle_show_results_for_room(self, room_id: str) -> None:
         """Send game results to all users in the room."""
         try:
-            game_state = self.game_gateway.get_room_state(room_id)
-            if not game_state:
-                logging.error(f"Could not get room state for room '{room_id}'")
+            ret_code, _, results_data = self.game_gateway.get_room_state(room_id)
+            if ret_code != InteractReturnCodes.SUCCESS:
+                logger.error("Could not get room state for room '%s': %s", room_id, ret_code)
                 return
                 
-            _, _, game_data = game_state
-            
-            # Parse results data
-            if isinstance(game_data, list):
-                results_data = game_data
-            elif isinstance(game_data, dict) and 'results' in game_data:
-                results_data = game_data['results']
-            else:
-                logging.error(f"Unexpected results format for room '{room_id}': {type(game_data)}")
+            if not isinstance(results_data, list):
+                logger.error("Unexpected results format for room '%s': %s", room_id, type(results_data))
                 return
                 
-            valid_results = [ResultDetail(**res) for res in results_data]
-            results_msg = ShowResultsServerMessage(results=valid_results)
+            # Scores come straight from the room, so skip re-validating them
+            valid_results = [ResultDetail.model_construct(user=res['user'], score=res['score']) for res in results_data]
+            results_msg = ShowResultsServerMessage.model_construct(results=valid_results)
             
             await self.connection_manager.broadcast_to_room(room_id, results_msg)
-            logging.info(f"Sent results to room '{room_id}' ({len(valid_results)} results)")
+            logger.info("Sent results to room '%s' (%s results)", room_id, len(valid_results))
             
         except (ValidationError, KeyError) as e:
-            logging.error(f"Error preparing results for room '{room_id}': {e}")
+            logger.error("Error preparing results for room '%s': %s", room_id, e)
         except Exception as e:
-            logging.error(f"Error handling results for room '{room_id}': {e}")
+            logger.error("Error handling results for room '%s': %s", room_id, e)
             
     async def handle_next_round_logic(self, room_id: str) -> None:
         """Advance the game to the next round or end the game."""
         try:
+            # Let players look at the results without blocking the event loop
+            await asyncio.sleep(self.RESULTS_DISPLAY_SECONDS)
+            
             if not self.connection_manager.room_exists(room_id):
-                logging.info(f"Skipping next round logic for non-existent room '{room_id}'")
+                logger.info("Skipping next round logic for non-existent room '%s'", room_id)
                 return
                 
             # Get any user from the room to trigger state advancement
             room_users = self.connection_manager.get_room_users(room_id)
             if not room_users:
-                logging.info(f"No users in room '{room_id}' for next round")
+                logger.info("No users in room '%s' for next round", room_id)
                 return
                 
             first_user = room_users[0]
@@ -142,28 +161,25 @@ class GameStateManager:
             self.game_gateway.submit_data(room_id, first_user, {})
             
             # Check new state and respond accordingly
-            game_state = self.game_gateway.get_room_state(room_id)
-            if not game_state:
-                logging.error(f"Could not get room state after advancing room '{room_id}'")
+            ret_code, current_game_state, _ = self.game_gateway.get_room_state(room_id)
+            if ret_code != InteractReturnCodes.SUCCESS:
+                logger.error("Could not get room state after advancing room '%s': %s", room_id, ret_code)
                 return
-                
-            _, state_val, _ = game_state
-            current_game_state = State(state_val) if state_val is not None else None
-            
-            logging.info(f"Room '{room_id}' advanced to state: {current_game_state.name if current_game_state else 'UNKNOWN'}")
+
+            logger.info("Room '%s' advanced to state: %s", room_id, current_game_state.name if current_game_state else 'UNKNOWN')
             
-            if current_game_state == State.COLLECTING_ANSWERS:
+            if current_game_state is State.COLLECTING_ANSWERS:
                 # Small delay before asking for next prompt
                 await asyncio.sleep(1)
                 await self.handle_ask_prompt_for_room(room_id)
                 
-            elif current_game_state == State.DONE:
-                done_msg = GameDoneServerMessage()
+            elif current_game_state is State.DONE:
+                done_msg = GameDoneServerMessage.model_construct()
                 await self.connection_manager.broadcast_to_room(room_id, done_msg)
-                logging.info(f"Game completed for room '{room_id}'")
+                logger.info("Game completed for room '%s'", room_id)
                 
             else:
-                logging.warning(f"Room '{room_id}' in unexpected state after next round: {current_game_state.name if current_game_state else 'UNKNOWN'}")
+                logger.warning("Room '%s' in unexpected state after next round: %s", room_id, current_game_state.name if current_game_state else 'UNKNOWN')
                 
         except Exception as e:
-            logging.error(f"Error in next round logic for room '{room_id}': {e}")
\ No newline at end of file
+            logger.error("Error in next round logic for room '%s': %s", room_id, e)
\ No newline at end of file
@@ -1,18 +1,19 @@
 from abc import ABC, abstractmethod
 import logging
 import websockets
-from typing import Optional, Dict
-from splash_club.contracts import IncomingMessage, UserUpdateServerMessage
+from typing import Optional
+from splash_club.contracts import IncomingMessage, OutgoingMessage, serialize_batch
 from splash_club.utils.error_handling import send_typed_error_message, send_generic_error
-from splash_club.connection_manager import ConnectionManager
+from splash_club.connection_manager import ConnectionManager, UserInfo
 from splash_club.game import GameGateway
+from splash_club.game_state_manager import GameStateManager
 
 logger = logging.getLogger(__name__)
 
 class BaseHandler(ABC):
     """Base class for all message handlers."""
     
-    def __init__(self, connection_manager: ConnectionManager, game_gateway: GameGateway, game_state_manager=None):
+    def __init__(self, connection_manager: ConnectionManager, game_gateway: GameGateway, game_state_manager: Optional[GameStateManager] = None):
         self.connection_manager = connection_manager
         self.game_gateway = game_gateway
         self.game_state_manager = game_state_manager
@@ -25,6 +26,12 @@ class BaseHandler(ABC):
         """
         pass
     
+    def get_game_state_manager(self) -> GameStateManager:
+        """Get the shared GameStateManager, creating one if this handler was built without it."""
+        if self.game_state_manager is None:
+            self.game_state_manager = GameStateManager(self.connection_manager, self.game_gateway)
+        return self.game_state_manager
+    
     async def send_error(
         self, 
         websocket: websockets.ServerConnection, 
@@ -32,7 +39,7 @@ class BaseHandler(ABC):
         request_id: Optional[str] = None
     ) -> bool:
         """Send a typed error message using enum member."""
-        return await send_typed_error_message(websocket, error_code_enum_member, request_id)
+        return await send_typed_error_message(self.connection_manager, websocket, error_code_enum_member, request_id)
     
     async def send_generic_error(
         self, 
@@ -41,53 +48,46 @@ class BaseHandler(ABC):
         request_id: Optional[str] = None
     ) -> bool:
         """Send a generic error message."""
-        return await send_generic_error(websocket, message, request_id)
+        return await send_generic_error(self.connection_manager, websocket, message, request_id)
     
-    def get_user_context(self, websocket: websockets.ServerConnection) -> Optional[Dict[str, str]]:
+    def get_user_context(self, websocket: websockets.ServerConnection) -> Optional[UserInfo]:
         """
-        Get the current user's room, user ID, and name from the websocket.
-        Returns dict with room_id, user_id, and user_name, or None if not authenticated.
+        Get the current user's room and user ID from the websocket.
+        Returns a UserInfo (room_id, user_id), or None if not registered.
         """
         return self.connection_manager.get_user_info(websocket)
     
-    def validate_user_in_room(
-        self, 
-        websocket: websockets.ServerConnection, 
-        expected_room_id: str, 
-        expected_user_id: str
+    async def send_join_ack(
+        self,
+        websocket: websockets.ServerConnection,
+        room_id: str,
+        user_id: str,
+        ack_message: OutgoingMessage,
+        sync_message: Optional[OutgoingMessage] = None
     ) -> bool:
         """
-        Validate that the websocket user matches the expected room and user.
-        Returns True if valid, False otherwise.
+        Send the join ack, the room's user list and any game state sync message
+        to the joining user in one frame, then queue the new user list for everyone
+        else in the room.
+        Returns True if the joining user's frame was sent.
         """
-        user_info = self.get_user_context(websocket)
-        if not user_info:
-            return False
-            
-        current_room_id = user_info.get("room_id")
-        current_user_id = user_info.get("user_id")
-        
-        if current_room_id != expected_room_id or current_user_id != expected_user_id:
-            logger.warning(
-                f"User validation failed: expected room='{expected_room_id}', "
-                f"user='{expected_user_id}' vs actual room='{current_room_id}', "
-                f"user='{current_user_id}' for {websocket.remote_address}"
-            )
-            return False
-        return True
+        frame_messages = [ack_message, self.connection_manager.get_user_update_frame(room_id)]
+        if sync_message is not None:
+            frame_messages.append(sync_message)
+        # A single frame keeps the ack ahead of the user list and the sync message with no delay between sends
+        sent = await self.connection_manager.safe_websocket_send(websocket, serialize_batch(frame_messages))
+        self.connection_manager.queue_user_update(room_id, already_sent_to=user_id)
+        return sent
 
     async def notify_room_users_updated(self, room_id: str) -> bool:
         """
         Notify all users in a room about user list updates.
-        Returns True if notification was sent successfully.
+        Changes in the same loop tick are coalesced into one broadcast.
+        Returns True if the notification was queued.
         """
         try:
-            users = self.connection_manager.get_room_users(room_id)
-            message = UserUpdateServerMessage(
-                users=users  # users is already a List[str], no need to extract ["id"]
-            )
-            await self.connection_manager.broadcast_to_room(room_id, message)
+            self.connection_manager.queue_user_update(room_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to notify room '{room_id}' of user updates: {e}")
+            logger.error("Failed to notify room '%s' of user updates: %s", room_id, e)
             return False
\ No newline at end of file
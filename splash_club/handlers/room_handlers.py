@@ -1,18 +1,21 @@
 # handlers/room_handlers.py
 
-import time
 import logging
 import websockets
+from typing import Optional
 from .base_handler import BaseHandler
 from splash_club.contracts import (
     CreateRoomClientMessage, JoinRoomClientMessage, ReJoinRoomClientMessage,
     JoinRoomSuccessServerMessage, ReJoinRoomSuccessServerMessage, RoomNotFoundServerMessage,
-    AskPromptServerMessage, AskVoteServerMessage, ShowResultsServerMessage, AnswerOptionForVote, ResultDetail
+    AskPromptServerMessage, AskVoteServerMessage, ShowResultsServerMessage, OutgoingMessage,
+    serialize_outgoing, validate_answer_options, validate_results
 )
 from splash_club.game import PromptRoom, JoinReturnCodes, State, InteractReturnCodes
 from splash_club.connection_manager import ConnectionManager
 from pydantic import ValidationError
 
+logger = logging.getLogger(__name__)
+
 
 class CreateRoomHandler(BaseHandler):
     """Handles room creation requests."""
@@ -31,24 +34,21 @@ class CreateRoomHandler(BaseHandler):
                 await self.connection_manager.register_user(websocket, room_id, user_id)
                 
                 # Send success response
-                join_ok_msg = JoinRoomSuccessServerMessage(
+                join_ok_msg = JoinRoomSuccessServerMessage.model_construct(
                     room=room_id, 
                     user=user_id, 
                     response_to_request_id=message.request_id
                 )
-                await self.connection_manager.safe_websocket_send(websocket, join_ok_msg.model_dump_json())
-                
-                # Notify other users (though for new room, this user is the only one)
-                await self.notify_room_users_updated(room_id)
+                await self.send_join_ack(websocket, room_id, user_id, join_ok_msg)
                 
-                logging.info(f"User '{user_id}' created and joined room '{room_id}'")
+                logger.info("User '%s' created and joined room '%s'", user_id, room_id)
                 return True
             else:
                 await self.send_error(websocket, ret_join, message.request_id)
                 return False
                 
         except Exception as e:
-            logging.error(f"Error creating room for user '{message.user}': {e}")
+            logger.error("Error creating room for user '%s': %s", message.user, e)
             await self.send_generic_error(websocket, "Failed to create room", message.request_id)
             return False
 
@@ -69,27 +69,22 @@ class JoinRoomHandler(BaseHandler):
                 await self.connection_manager.register_user(websocket, room_id, user_id)
                 
                 # Send success response
-                join_ok_msg = JoinRoomSuccessServerMessage(
+                join_ok_msg = JoinRoomSuccessServerMessage.model_construct(
                     room=room_id, 
                     user=user_id, 
                     response_to_request_id=message.request_id
                 )
-                await self.connection_manager.safe_websocket_send(websocket, join_ok_msg.model_dump_json())
-                
-                # Small delay to ensure message ordering (as in original)
-                time.sleep(0.1)
+                # Ack plus user list for the joiner, user list for everyone else
+                await self.send_join_ack(websocket, room_id, user_id, join_ok_msg)
                 
-                # Notify all users in room about the new user
-                await self.notify_room_users_updated(room_id)
-                
-                logging.info(f"User '{user_id}' joined room '{room_id}'")
+                logger.info("User '%s' joined room '%s'", user_id, room_id)
                 return True
             else:
                 await self.send_error(websocket, ret_join, message.request_id)
                 return False
                 
         except Exception as e:
-            logging.error(f"Error joining room '{message.room}' for user '{message.user}': {e}")
+            logger.error("Error joining room '%s' for user '%s': %s", message.room, message.user, e)
             await self.send_generic_error(websocket, "Failed to join room", message.request_id)
             return False
 
@@ -110,119 +105,115 @@ class ReJoinRoomHandler(BaseHandler):
                 await self.connection_manager.register_user(websocket, room_id, user_id)
                 
                 # Send success response
-                rejoin_ok_msg = ReJoinRoomSuccessServerMessage(
+                rejoin_ok_msg = ReJoinRoomSuccessServerMessage.model_construct(
                     room=room_id, 
                     user=user_id, 
                     response_to_request_id=message.request_id
                 )
-                await self.connection_manager.safe_websocket_send(websocket, rejoin_ok_msg.model_dump_json())
-                
-                # Small delay to ensure message ordering
-                time.sleep(0.1)
-                
-                # Notify all users in room
-                await self.notify_room_users_updated(room_id)
+                # Ack, user list and game state sync go out together, in that order
+                sync_message = self._get_game_state_sync(room_id, user_id)
+                await self.send_join_ack(websocket, room_id, user_id, rejoin_ok_msg, sync_message)
                 
-                # NEW: Send game state synchronization messages
-                await self._send_game_state_sync(websocket, room_id, user_id)
-                
-                logging.info(f"User '{user_id}' rejoined room '{room_id}'")
+                logger.info("User '%s' rejoined room '%s'", user_id, room_id)
                 return True
             elif ret_join == JoinReturnCodes.ROOM_NOT_FOUND:
-                room_not_found = RoomNotFoundServerMessage()
-                await self.connection_manager.safe_websocket_send(websocket, room_not_found.model_dump_json())
+                room_not_found = RoomNotFoundServerMessage.model_construct()
+                await self.connection_manager.safe_websocket_send(websocket, serialize_outgoing(room_not_found))
                 return False
             else:
                 await self.send_error(websocket, ret_join, message.request_id)
                 return False
                 
         except Exception as e:
-            logging.error(f"Error rejoining room '{message.room}' for user '{message.user}': {e}")
+            logger.error("Error rejoining room '%s' for user '%s': %s", message.room, message.user, e)
             await self.send_generic_error(websocket, "Failed to rejoin room", message.request_id)
             return False
     
-    async def _send_game_state_sync(self, websocket: websockets.ServerConnection, room_id: str, user_id: str) -> None:
-        """Send appropriate game state messages to sync the rejoining client."""
+    def _get_game_state_sync(self, room_id: str, user_id: str) -> Optional[OutgoingMessage]:
+        """
+        Build the game state message that syncs a rejoining client.
+        Returns None if the client needs no sync message or it could not be built.
+        """
         try:
             # Get current game state
             game_state = self.game_gateway.get_room_state(room_id, user_id)
             if not game_state:
-                logging.error(f"Could not get room state for user '{user_id}' in room '{room_id}' during rejoin sync")
-                return
+                logger.error("Could not get room state for user '%s' in room '%s' during rejoin sync", user_id, room_id)
+                return None
                 
-            ret_code, state_val, game_data = game_state
+            ret_code, current_state, game_data = game_state
             
             if ret_code != InteractReturnCodes.SUCCESS:
-                logging.error(f"Failed to get room state for user '{user_id}' in room '{room_id}': {ret_code}")
-                return
-                
-            current_state = State(state_val) if state_val is not None else None
-            
-            if current_state == State.WAITING_TO_START:
+                logger.error("Failed to get room state for user '%s' in room '%s': %s", user_id, room_id, ret_code)
+                return None
+
+            if current_state is State.WAITING_TO_START:
                 # Client will stay on waiting page, no additional message needed
-                logging.info(f"User '{user_id}' rejoined room '{room_id}' in WAITING_TO_START state")
+                logger.info("User '%s' rejoined room '%s' in WAITING_TO_START state", user_id, room_id)
                 
-            elif current_state == State.COLLECTING_ANSWERS:
+            elif current_state is State.COLLECTING_ANSWERS:
                 # Handle the new dictionary format for COLLECTING_ANSWERS state
                 if isinstance(game_data, dict) and 'prompt' in game_data:
                     player_has_answered = game_data.get('player_has_answered', False)
                     prompt_text = game_data['prompt']
                     
                     # Always send the prompt message, but indicate if they've already answered
-                    prompt_message = AskPromptServerMessage(
+                    prompt_message = AskPromptServerMessage.model_construct(
                         prompt=prompt_text,
                         already_answered=player_has_answered
                     )
-                    await self.connection_manager.safe_websocket_send(websocket, prompt_message.model_dump_json())
-                    
                     if player_has_answered:
-                        logging.info(f"User '{user_id}' rejoined room '{room_id}' and has already submitted an answer")
+                        logger.info("User '%s' rejoined room '%s' and has already submitted an answer", user_id, room_id)
                     else:
-                        logging.info(f"User '{user_id}' rejoined room '{room_id}' and needs to submit an answer")
+                        logger.info("User '%s' rejoined room '%s' and needs to submit an answer", user_id, room_id)
+                    return prompt_message
                 else:
-                    logging.error(f"Unexpected prompt format for room '{room_id}' during rejoin: {type(game_data)}")
+                    logger.error("Unexpected prompt format for room '%s' during rejoin: %s", room_id, type(game_data))
                 
-            elif current_state == State.VOTING:
+            elif current_state is State.VOTING:
                 # Only send voting options if player hasn't already voted
                 if isinstance(game_data, dict) and 'prompt' in game_data and 'answers' in game_data:
                     try:
-                        print("PRINTING OUT GAME DATA", game_data)
                         player_has_voted = game_data.get('player_has_voted', False)
                         answers_data = game_data.get('answers', [])
                         prompt_text = game_data.get('prompt', '')
                         
-                        valid_answers = [AnswerOptionForVote(**ans) for ans in answers_data]
-                        vote_msg = AskVoteServerMessage(prompt=prompt_text, answers=valid_answers, voted=player_has_voted)
+                        if not isinstance(answers_data, list):
+                            logger.error("Unexpected vote options for room '%s' during rejoin: %s", room_id, type(answers_data))
+                            return None
+                        valid_answers = validate_answer_options(answers_data)
+                        vote_msg = AskVoteServerMessage.model_construct(prompt=prompt_text, answers=valid_answers, voted=player_has_voted)
                         
-                        await self.connection_manager.safe_websocket_send(websocket, vote_msg.model_dump_json())
-                        logging.info(f"Sent vote sync to rejoining user '{user_id}' in room '{room_id}' (not yet voted)")
+                        logger.info("Sending vote sync to rejoining user '%s' in room '%s'", user_id, room_id)
+                        return vote_msg
                             
                     except (KeyError, ValidationError) as e:
-                        logging.error(f"Error preparing vote sync message for user '{user_id}' in room '{room_id}': {e}")
+                        logger.error("Error preparing vote sync message for user '%s' in room '%s': %s", user_id, room_id, e)
                 else:
-                    logging.error(f"Unexpected vote data format for room '{room_id}' during rejoin: {type(game_data)}")
+                    logger.error("Unexpected vote data format for room '%s' during rejoin: %s", room_id, type(game_data))
                     
-            elif current_state == State.SHOWING_RESULTS:
+            elif current_state is State.SHOWING_RESULTS:
                 # Send results to get client to results page
                 if isinstance(game_data, list):
                     try:
-                        valid_results = [ResultDetail(**res) for res in game_data]
-                        results_msg = ShowResultsServerMessage(results=valid_results)
+                        valid_results = validate_results(game_data)
+                        results_msg = ShowResultsServerMessage.model_construct(results=valid_results)
                         
-                        await self.connection_manager.safe_websocket_send(websocket, results_msg.model_dump_json())
-                        logging.info(f"Sent results sync to rejoining user '{user_id}' in room '{room_id}'")
+                        logger.info("Sending results sync to rejoining user '%s' in room '%s'", user_id, room_id)
+                        return results_msg
                         
                     except (ValidationError, KeyError) as e:
-                        logging.error(f"Error preparing results sync message for user '{user_id}' in room '{room_id}': {e}")
+                        logger.error("Error preparing results sync message for user '%s' in room '%s': %s", user_id, room_id, e)
                 else:
-                    logging.error(f"Unexpected results format for room '{room_id}' during rejoin: {type(game_data)}")
+                    logger.error("Unexpected results format for room '%s' during rejoin: %s", room_id, type(game_data))
                     
-            elif current_state == State.DONE:
+            elif current_state is State.DONE:
                 # Game is over, client will stay on waiting/results page
-                logging.info(f"User '{user_id}' rejoined room '{room_id}' in DONE state")
+                logger.info("User '%s' rejoined room '%s' in DONE state", user_id, room_id)
                 
             else:
-                logging.warning(f"Unknown game state '{current_state}' for room '{room_id}' during rejoin sync")
+                logger.warning("Unknown game state '%s' for room '%s' during rejoin sync", current_state, room_id)
                 
         except Exception as e:
-            logging.error(f"Error sending game state sync for user '{user_id}' in room '{room_id}': {e}")
\ No newline at end of file
+            logger.error("Error building game state sync for user '%s' in room '%s': %s", user_id, room_id, e)
+        return None
\ No newline at end of file
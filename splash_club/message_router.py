@@ -65,8 +65,9 @@ class MessageRouter:
         handler = self.handlers.get(message_type)
         
         if not handler:
-            logger.warning(f"No handler found for message type: {message_type}")
+            logger.warning("No handler found for message type: %s", message_type)
             await send_generic_error(
+                self.connection_manager,
                 websocket, 
                 f"Unknown message type: {message_type}",
                 parsed_message.request_id
@@ -76,8 +77,9 @@ class MessageRouter:
         try:
             return await handler.handle(websocket, parsed_message)
         except Exception as e:
-            logger.exception(f"Handler error for {message_type}: {e}")
+            logger.exception("Handler error for %s: %s", message_type, e)
             await send_generic_error(
+                self.connection_manager,
                 websocket, 
                 "Internal server error",
                 parsed_message.request_id
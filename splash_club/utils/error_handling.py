@@ -1,42 +1,53 @@
 import logging
 import websockets
-from typing import Optional
-from splash_club.contracts import ErrorServerMessage, RoomNotFoundServerMessage
-from .websocket_utils import safe_websocket_send
+from typing import Dict, Optional
+from splash_club.contracts import ErrorServerMessage, RoomNotFoundServerMessage, serialize_outgoing
+from splash_club.connection_manager import ConnectionManager
 
 logger = logging.getLogger(__name__)
 
+# Error frames without a request id are fixed per error, so serialize each one once.
+# Frames carrying a (client-supplied) request id still go through pydantic for escaping.
+_ROOM_NOT_FOUND_FRAME = serialize_outgoing(RoomNotFoundServerMessage.model_construct())
+_TYPED_ERROR_FRAMES: Dict[str, bytes] = {}
+
+def _typed_error_frame(error_name: str, request_id: Optional[str]) -> bytes:
+    """Get the serialized error for an enum member name, cached when there's no request id."""
+    if request_id is not None:
+        return serialize_outgoing(ErrorServerMessage.model_construct(message=error_name, response_to_request_id=request_id))
+    frame = _TYPED_ERROR_FRAMES.get(error_name)
+    if frame is None:
+        frame = _TYPED_ERROR_FRAMES[error_name] = serialize_outgoing(ErrorServerMessage.model_construct(message=error_name))
+    return frame
+
 async def send_typed_error_message(
+    connection_manager: ConnectionManager,
     websocket: websockets.ServerConnection, 
     error_code_enum_member, 
     request_id: Optional[str] = None
 ) -> bool:
     """Sends a Pydantic ErrorServerMessage using the enum member's name."""
-    error_msg = ErrorServerMessage(
-        message=error_code_enum_member.name, 
-        response_to_request_id=request_id
-    )
-    success = await safe_websocket_send(websocket, error_msg.model_dump_json())
+    success = await connection_manager.safe_websocket_send(websocket, _typed_error_frame(error_code_enum_member.name, request_id))
     if not success:
-        logger.warning(f"Failed to send error to {websocket.remote_address}")
+        logger.warning("Failed to send error to %s", websocket.remote_address)
     return success
 
-async def send_room_not_found(websocket: websockets.ServerConnection) -> bool:
+async def send_room_not_found(connection_manager: ConnectionManager, websocket: websockets.ServerConnection) -> bool:
     """Sends a RoomNotFoundServerMessage."""
-    error_msg = RoomNotFoundServerMessage()
-    success = await safe_websocket_send(websocket, error_msg.model_dump_json())
+    success = await connection_manager.safe_websocket_send(websocket, _ROOM_NOT_FOUND_FRAME)
     if not success:
-        logger.warning(f"Failed to send room not found error to {websocket.remote_address}")
+        logger.warning("Failed to send room not found error to %s", websocket.remote_address)
     return success
 
 async def send_generic_error(
+    connection_manager: ConnectionManager,
     websocket: websockets.ServerConnection, 
     message: str, 
     request_id: Optional[str] = None
 ) -> bool:
     """Sends a generic error message."""
-    error_msg = ErrorServerMessage(message=message, response_to_request_id=request_id)
-    success = await safe_websocket_send(websocket, error_msg.model_dump_json())
+    error_msg = ErrorServerMessage.model_construct(message=message, response_to_request_id=request_id)
+    success = await connection_manager.safe_websocket_send(websocket, serialize_outgoing(error_msg))
     if not success:
-        logger.warning(f"Failed to send generic error to {websocket.remote_address}")
+        logger.warning("Failed to send generic error to %s", websocket.remote_address)
     return success
\ No newline at end of file
@@ -1,7 +1,8 @@
 import asyncio
 import logging
+import socket
 import websockets
-from typing import Optional
+from typing import Optional, Union
 from splash_club.connection_manager import ConnectionManager
 from splash_club.message_router import MessageRouter
 from splash_club.game_state_manager import GameStateManager
@@ -32,45 +33,65 @@ class WebSocketServer:
     async def handle_connection(self, websocket: websockets.ServerConnection):
         """Handle a single WebSocket connection throughout its lifecycle."""
         client_address = websocket.remote_address
-        logger.info(f"Client connected: {client_address}")
+        logger.info("Client connected: %s", client_address)
+        self._set_nodelay(websocket)
         
         try:
-            async for message_str in websocket:
-                await self._process_message(websocket, str(message_str))
+            while True:
+                # Take text frames as raw UTF-8 bytes; pydantic parses them without a str decode
+                message_data = await websocket.recv(decode=False)
+                await self._process_message(websocket, message_data)
                 
         except websockets.exceptions.ConnectionClosedOK:
-            logger.info(f"Client disconnected gracefully: {client_address}")
+            logger.info("Client disconnected gracefully: %s", client_address)
         except websockets.exceptions.ConnectionClosedError as e:
-            logger.warning(f"Client connection closed with error: {client_address}, Error: {e}")
+            logger.warning("Client connection closed with error: %s, Error: %s", client_address, e)
         except Exception as e:
-            logger.exception(f"Unexpected error in connection handler for {client_address}: {e}")
+            logger.exception("Unexpected error in connection handler for %s: %s", client_address, e)
         finally:
             await self.connection_manager.unregister_user(websocket)
-            logger.info(f"Client connection cleaned up: {client_address}")
+            logger.info("Client connection cleaned up: %s", client_address)
     
-    async def _process_message(self, websocket: websockets.ServerConnection, message_str: str):
+    @staticmethod
+    def _set_nodelay(websocket: websockets.ServerConnection) -> None:
+        """
+        Disable Nagle's algorithm so small game frames go out immediately.
+        asyncio already does this for TCP transports; set it explicitly so other loops behave the same.
+        """
+        sock = websocket.transport.get_extra_info("socket")
+        if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+            return
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError as e:
+            logger.debug("Could not set TCP_NODELAY for %s: %s", websocket.remote_address, e)
+    
+    async def _process_message(self, websocket: websockets.ServerConnection, message_str: Union[str, bytes]):
         """Process a single message from a WebSocket connection."""
         # Parse the message
         parsed_message, parse_error = parse_message_safely(message_str)
         
         if parsed_message is None:
-            logger.error(f"Failed to parse message from {websocket.remote_address}: {parse_error}")
-            await send_generic_error(websocket, f"Message parsing failed: {parse_error}")
+            logger.error("Failed to parse message from %s: %s", websocket.remote_address, parse_error)
+            await send_generic_error(self.connection_manager, websocket, f"Message parsing failed: {parse_error}")
             return
         
-        logger.info(f"Received '{parsed_message.type}' from {websocket.remote_address}")
+        # Per-message log: lazy args so nothing is formatted unless DEBUG is on
+        logger.debug("Received '%s' from %s", parsed_message.type, websocket.remote_address)
         
         # Route the message to appropriate handler
         success = await self.message_router.route_message(websocket, parsed_message)
         
         if not success:
-            logger.warning(f"Failed to handle {parsed_message.type} from {websocket.remote_address}")
+            logger.warning("Failed to handle %s from %s", parsed_message.type, websocket.remote_address)
     
     async def start(self):
         """Start the WebSocket server."""
-        logger.info(f"Starting WebSocket server on ws://{self.host}:{self.port}")
+        logger.info("Starting WebSocket server on ws://%s:%s", self.host, self.port)
         
-        async with websockets.serve(self.handle_connection, self.host, self.port):
+        # Frames are small JSON; per-connection deflate costs more CPU/RAM than it saves,
+        # and broadcasts would compress the same payload once per recipient
+        async with websockets.serve(self.handle_connection, self.host, self.port, compression=None):
             # Keep the server running
             await asyncio.Future()
     
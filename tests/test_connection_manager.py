@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+import websockets
+
+from splash_club.connection_manager import ConnectionManager, _coalesce_frames
+from splash_club.contracts import UserUpdateServerMessage
+from splash_club.utils.error_handling import send_generic_error
+
+
+class TestConnectionManager:
+    """Test suite for ConnectionManager outbound queues and broadcasts."""
+
+    @pytest.fixture
+    def manager(self):
+        """Create a ConnectionManager instance."""
+        return ConnectionManager()
+
+    @pytest.fixture
+    def make_websocket(self):
+        """Factory for mock websockets."""
+        def _make(address=("127.0.0.1", 12345)):
+            websocket = AsyncMock()
+            websocket.send = AsyncMock()
+            websocket.remote_address = address
+            return websocket
+        return _make
+
+    def test_coalesce_frames(self):
+        """Test that queued frames merge into one array and batches are spliced in"""
+        frame = _coalesce_frames([b'{"type":"a"}', b'[{"type":"b"},{"type":"c"}]', b'{"type":"d"}'])
+        assert [m["type"] for m in json.loads(frame)] == ["a", "b", "c", "d"]
+
+    def test_coalesce_frames_skips_empty_batches(self):
+        """Test that an empty batch contributes no element to the merged frame"""
+        frame = _coalesce_frames([b'[]', b'{"type":"a"}', b'[]', b'[{"type":"b"}]', b'[]'])
+        assert [m["type"] for m in json.loads(frame)] == ["a", "b"]
+        assert json.loads(_coalesce_frames([b'[]', b'[]'])) == []
+
+    @pytest.mark.asyncio
+    async def test_unregistered_send_is_direct(self, manager, make_websocket):
+        """Test that sockets without an outbox are sent to immediately"""
+        websocket = make_websocket()
+        assert await manager.safe_websocket_send(websocket, b'{"type":"error"}') is True
+        websocket.send.assert_awaited_once_with(b'{"type":"error"}', text=True)
+
+    @pytest.mark.asyncio
+    async def test_registered_sends_are_queued_and_coalesced(self, manager, make_websocket):
+        """Test that frames queued before the writer runs go out as one frame in order"""
+        websocket = make_websocket()
+        await manager.register_user(websocket, "ABCD", "alice")
+
+        assert await manager.safe_websocket_send(websocket, b'{"type":"a"}') is True
+        assert await manager.safe_websocket_send(websocket, '{"type":"b"}') is True
+        websocket.send.assert_not_awaited()
+
+        await asyncio.sleep(0)
+        websocket.send.assert_awaited_once()
+        frame = websocket.send.call_args[0][0]
+        assert [m["type"] for m in json.loads(frame)] == ["a", "b"]
+
+        await manager.unregister_user(websocket)
+
+    @pytest.mark.asyncio
+    async def test_unregister_stops_writer(self, manager, make_websocket):
+        """Test that unregistering cancels the writer and drops the outbox"""
+        websocket = make_websocket()
+        await manager.register_user(websocket, "ABCD", "alice")
+        writer = manager._writers[websocket]
+
+        await manager.unregister_user(websocket)
+        await asyncio.sleep(0)
+        assert writer.cancelled()
+        assert websocket not in manager._outboxes
+
+    @pytest.mark.asyncio
+    async def test_full_outbox_closes_connection(self, manager, make_websocket):
+        """Test that a client that can't keep up is closed instead of buffering forever"""
+        manager.OUTBOX_MAX_SIZE = 1
+        websocket = make_websocket()
+        await manager.register_user(websocket, "ABCD", "alice")
+
+        assert await manager.safe_websocket_send(websocket, b'{"type":"a"}') is True
+        assert await manager.safe_websocket_send(websocket, b'{"type":"b"}') is False
+        await asyncio.sleep(0)
+        websocket.close.assert_awaited_once()
+
+        await manager.unregister_user(websocket)
+
+    @pytest.mark.asyncio
+    async def test_unregister_does_not_cancel_slow_close(self, manager, make_websocket):
+        """Test that disconnecting right after an overflow still lets the eviction close finish"""
+        manager.OUTBOX_MAX_SIZE = 1
+        websocket = make_websocket()
+        await manager.register_user(websocket, "ABCD", "alice")
+
+        await manager.safe_websocket_send(websocket, b'{"type":"a"}')
+        assert await manager.safe_websocket_send(websocket, b'{"type":"b"}') is False
+        await manager.unregister_user(websocket)
+        await asyncio.sleep(0)
+        websocket.close.assert_awaited_once()
+        await asyncio.sleep(0)
+        assert not manager._closing
+
+    @pytest.mark.asyncio
+    async def test_broadcast_excludes_user(self, manager, make_websocket):
+        """Test that broadcast_to_room can skip one user"""
+        alice, bob = make_websocket(("127.0.0.1", 1)), make_websocket(("127.0.0.1", 2))
+        await manager.register_user(alice, "ABCD", "alice")
+        await manager.register_user(bob, "ABCD", "bob")
+
+        sent = await manager.broadcast_to_room("ABCD", UserUpdateServerMessage(users=["alice", "bob"]), exclude_user="alice")
+        assert sent == 1
+        await asyncio.sleep(0)
+        alice.send.assert_not_awaited()
+        bob.send.assert_awaited_once()
+
+        await manager.unregister_user(alice)
+        await manager.unregister_user(bob)
+
+    @pytest.mark.asyncio
+    async def test_user_update_frame_cached_until_membership_changes(self, manager, make_websocket):
+        """Test that the room user list and user_update frame are reused until someone joins or leaves"""
+        alice, bob = make_websocket(("127.0.0.1", 1)), make_websocket(("127.0.0.1", 2))
+        await manager.register_user(alice, "ABCD", "alice")
+
+        frame = manager.get_user_update_frame("ABCD")
+        assert json.loads(frame) == {"type": "user_update", "users": ["alice"]}
+        assert manager.get_user_update_frame("ABCD") is frame
+        assert manager.get_room_users("ABCD") is manager.get_room_users("ABCD")
+
+        await manager.register_user(bob, "ABCD", "bob")
+        assert json.loads(manager.get_user_update_frame("ABCD"))["users"] == ["alice", "bob"]
+
+        await manager.unregister_user(alice)
+        assert manager.get_room_users("ABCD") == ["bob"]
+
+        await manager.unregister_user(bob)
+        assert manager.get_room_users("ABCD") == []
+        assert "ABCD" not in manager._user_update_frame_cache
+
+    @pytest.mark.asyncio
+    async def test_lookups_do_not_create_empty_rooms(self, manager, make_websocket):
+        """Test that reading unknown rooms leaves no entries and empty rooms are dropped"""
+        assert manager.get_room_users("ZZZZ") == []
+        assert not manager.room_exists("ZZZZ")
+        assert await manager.broadcast_to_room("ZZZZ", UserUpdateServerMessage(users=[])) == 0
+        assert manager.users == {}
+
+        websocket = make_websocket()
+        await manager.register_user(websocket, "ABCD", "alice")
+        await manager.unregister_user(websocket)
+        assert manager.users == {}
+
+    @pytest.mark.asyncio
+    async def test_broadcast_skips_connection_closed_as_slow(self, manager, make_websocket):
+        """Test that a user whose outbox overflowed is not sent to directly afterwards"""
+        manager.OUTBOX_MAX_SIZE = 1
+        alice, bob = make_websocket(("127.0.0.1", 1)), make_websocket(("127.0.0.1", 2))
+        await manager.register_user(alice, "ABCD", "alice")
+        await manager.register_user(bob, "ABCD", "bob")
+
+        await manager.safe_websocket_send(alice, b'{"type":"a"}')
+        await manager.safe_websocket_send(alice, b'{"type":"b"}')
+        sent = await manager.broadcast_to_room("ABCD", UserUpdateServerMessage(users=["alice", "bob"]))
+        assert sent == 1
+        await asyncio.sleep(0)
+        alice.send.assert_not_awaited()
+
+        await manager.unregister_user(alice)
+        await manager.unregister_user(bob)
+
+    @pytest.mark.asyncio
+    async def test_user_updates_coalesce_per_tick(self, manager, make_websocket):
+        """Test that joins in one tick share a single user_update and skip users already sent it"""
+        alice, bob, carol = (make_websocket(("127.0.0.1", port)) for port in (1, 2, 3))
+        await manager.register_user(alice, "ABCD", "alice")
+        await manager.register_user(bob, "ABCD", "bob")
+        manager.queue_user_update("ABCD", already_sent_to="bob")
+        await manager.register_user(carol, "ABCD", "carol")
+        manager.get_user_update_frame("ABCD")
+        manager.queue_user_update("ABCD", already_sent_to="carol")
+
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        carol.send.assert_not_awaited()
+        for websocket in (alice, bob):
+            websocket.send.assert_awaited_once()
+            assert json.loads(websocket.send.call_args[0][0])["users"] == ["alice", "bob", "carol"]
+
+        for websocket in (alice, bob, carol):
+            await manager.unregister_user(websocket)
+
+    @pytest.mark.asyncio
+    async def test_writer_exit_drops_outbox(self, manager, make_websocket):
+        """Test that a writer stopped by a closed connection leaves no outbox accepting sends"""
+        websocket = make_websocket()
+        websocket.send.side_effect = websockets.exceptions.ConnectionClosed(None, None)
+        await manager.register_user(websocket, "ABCD", "alice")
+
+        assert await manager.safe_websocket_send(websocket, b'{"type":"a"}') is True
+        await asyncio.sleep(0)
+        assert websocket not in manager._outboxes
+        assert websocket not in manager._writers
+        assert await manager.safe_websocket_send(websocket, b'{"type":"b"}') is False
+
+        await manager.unregister_user(websocket)
+
+    @pytest.mark.asyncio
+    async def test_errors_go_through_outbox(self, manager, make_websocket):
+        """Test that error replies queue behind frames already sent to a registered client"""
+        websocket = make_websocket()
+        await manager.register_user(websocket, "ABCD", "alice")
+
+        await manager.safe_websocket_send(websocket, b'{"type":"a"}')
+        await send_generic_error(manager, websocket, "nope")
+        websocket.send.assert_not_awaited()
+
+        await asyncio.sleep(0)
+        frame = websocket.send.call_args[0][0]
+        assert [m["type"] for m in json.loads(frame)] == ["a", "error"]
+
+        await manager.unregister_user(websocket)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from splash_club.contracts import (
+    parse_incoming_message, parse_outgoing_message, serialize_outgoing, serialize_batch,
+    CreateRoomClientMessage, SubmitAnswerClientMessage, AskPromptServerMessage,
+    AskVoteServerMessage, AnswerOptionForVote, validate_answer_options,
+    ResultDetail, validate_results,
+    JoinRoomSuccessServerMessage, UserUpdateServerMessage,
+)
+
+
+class TestParseHelpers:
+    """Test the cached parse helpers"""
+
+    def test_parse_incoming_create_room(self):
+        """Test parsing a create_room message"""
+        msg = parse_incoming_message('{"type": "create_room", "user": "alice"}')
+        assert isinstance(msg, CreateRoomClientMessage)
+        assert msg.user == "alice"
+
+    def test_parse_incoming_submit_answer(self):
+        """Test parsing a submit_answer message"""
+        msg = parse_incoming_message(
+            '{"type": "submit_answer", "answer": "yes", "request_id": "1"}'
+        )
+        assert isinstance(msg, SubmitAnswerClientMessage)
+        assert msg.answer == "yes"
+        assert msg.request_id == "1"
+
+    def test_parse_incoming_bytes(self):
+        """Test parsing a message straight from frame bytes"""
+        msg = parse_incoming_message('{"type": "submit_answer", "answer": "zoë ø"}'.encode())
+        assert isinstance(msg, SubmitAnswerClientMessage)
+        assert msg.answer == "zoë ø"
+
+    def test_parse_incoming_repeated_calls(self):
+        """Test that the shared adapter can be reused across calls"""
+        for i in range(3):
+            msg = parse_incoming_message(f'{{"type": "create_room", "user": "user{i}"}}')
+            assert isinstance(msg, CreateRoomClientMessage)
+            assert msg.user == f"user{i}"
+
+    def test_parse_incoming_invalid(self):
+        """Test that invalid messages raise a ValidationError"""
+        with pytest.raises(ValidationError):
+            parse_incoming_message('{"type": "join_room", "room": "ABCD"}')
+
+    def test_parse_incoming_unknown_type(self):
+        """Test that an unknown message type is rejected by the discriminator"""
+        with pytest.raises(ValidationError) as exc_info:
+            parse_incoming_message('{"type": "not_a_message", "user": "alice"}')
+        assert exc_info.value.errors()[0]["type"] == "union_tag_invalid"
+
+    def test_parse_incoming_missing_type(self):
+        """Test that a message without a type is rejected"""
+        with pytest.raises(ValidationError) as exc_info:
+            parse_incoming_message('{"user": "alice"}')
+        assert exc_info.value.errors()[0]["type"] == "union_tag_not_found"
+
+    def test_parse_outgoing_ask_prompt(self):
+        """Test parsing an outgoing ask_prompt message"""
+        msg = parse_outgoing_message('{"type": "ask_prompt", "prompt": "Why?"}')
+        assert isinstance(msg, AskPromptServerMessage)
+        assert msg.already_answered is False
+
+
+class TestSerializeOutgoing:
+    """Test serialization of server messages"""
+
+    def test_serialize_returns_bytes(self):
+        """Test that serialized messages are JSON bytes"""
+        payload = serialize_outgoing(AskPromptServerMessage(prompt="Why?"))
+        assert isinstance(payload, bytes)
+        assert json.loads(payload) == {
+            "type": "ask_prompt",
+            "prompt": "Why?",
+            "already_answered": False,
+        }
+
+    def test_serialize_keeps_set_request_id(self):
+        """Test that a set response_to_request_id is still sent"""
+        payload = serialize_outgoing(AskPromptServerMessage(prompt="Why?", response_to_request_id="7"))
+        assert json.loads(payload)["response_to_request_id"] == "7"
+
+    def test_serialize_round_trip(self):
+        """Test that serialized messages parse back to the same model"""
+        msg = AskVoteServerMessage(
+            prompt="Why?",
+            answers=[AnswerOptionForVote(id="bob", text="BECAUSE")],
+        )
+        assert parse_outgoing_message(serialize_outgoing(msg)) == msg
+
+    def test_serialize_batch(self):
+        """Test that a batch is a JSON array of the messages in order"""
+        payload = serialize_batch([
+            JoinRoomSuccessServerMessage(room="ABCD", user="alice"),
+            UserUpdateServerMessage(users=["alice", "bob"]),
+        ])
+        assert json.loads(payload) == [
+            {"type": "join_room_ok", "room": "ABCD", "user": "alice"},
+            {"type": "user_update", "users": ["alice", "bob"]},
+        ]
+
+    def test_serialize_batch_accepts_serialized_messages(self):
+        """Test that pre-serialized messages are spliced into the batch as-is"""
+        users_frame = serialize_outgoing(UserUpdateServerMessage(users=["alice"]))
+        payload = serialize_batch([JoinRoomSuccessServerMessage(room="ABCD", user="alice"), users_frame])
+        assert [m["type"] for m in json.loads(payload)] == ["join_room_ok", "user_update"]
+
+
+class TestValidateAnswerOptions:
+    """Test batch validation of vote options"""
+
+    def test_validate_answer_options(self):
+        """Test that a list of dicts becomes a list of models"""
+        options = validate_answer_options([
+            {"id": "bob", "text": "BECAUSE"},
+            {"id": "charlie", "text": "WHY NOT"},
+        ])
+        assert options == [
+            AnswerOptionForVote(id="bob", text="BECAUSE"),
+            AnswerOptionForVote(id="charlie", text="WHY NOT"),
+        ]
+
+    def test_validate_results(self):
+        """Test that a list of result dicts becomes a list of models"""
+        results = validate_results([{"user": "alice", "score": 2}, {"user": "bob", "score": 0}])
+        assert results == [ResultDetail(user="alice", score=2), ResultDetail(user="bob", score=0)]
+
+    def test_validate_answer_options_invalid(self):
+        """Test that a malformed option raises a ValidationError"""
+        with pytest.raises(ValidationError):
+            validate_answer_options([{"id": "bob"}])
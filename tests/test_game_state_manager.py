@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from splash_club.game_state_manager import GameStateManager
+
+
+class TestGameStateManager:
+    """Test suite for GameStateManager background scheduling."""
+
+    @pytest.fixture
+    def manager(self):
+        """Create a GameStateManager with mocked dependencies."""
+        return GameStateManager(MagicMock(), MagicMock())
+
+    @pytest.mark.asyncio
+    async def test_schedule_next_round_once_per_room(self, manager):
+        """Test that a room can only have one pending next-round task"""
+        release = asyncio.Event()
+
+        async def next_round(room_id):
+            await release.wait()
+
+        manager.handle_next_round_logic = AsyncMock(side_effect=next_round)
+
+        assert manager.schedule_next_round("ABCD") is True
+        assert manager.schedule_next_round("ABCD") is False
+        assert manager.schedule_next_round("EFGH") is True
+
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert manager._next_round_tasks == {}
+        assert manager.handle_next_round_logic.await_count == 2
+
+        assert manager.schedule_next_round("ABCD") is True
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
@@ -8,7 +8,7 @@ from typing import Dict, Any
 
 # Import the classes we're testing
 from splash_club.game import (  # Replace 'your_module' with actual module name
-    PromptRoom, GameGateway, Player, State, 
+    PromptRoom, GameGateway, State, 
     JoinReturnCodes, StartReturnCodes, InteractReturnCodes,
     _random_id, _load_prompts
 )
@@ -37,15 +37,6 @@ class TestUtilityFunctions:
         assert prompts[1] == ("Question2", "Answer2")
 
 
-class TestPlayer:
-    """Test Player class"""
-    
-    def test_player_initialization(self):
-        """Test player can be created"""
-        player = Player()
-        assert isinstance(player, Player)
-
-
 class TestPromptRoom:
     """Test PromptRoom class"""
     
@@ -57,7 +48,7 @@ class TestPromptRoom:
             ("What is the capital of France?", "PARIS"),
             ("What color is the sky?", "BLUE")
         ]):
-            return PromptRoom()
+            yield PromptRoom()
     
     @pytest.fixture
     def room_with_players(self, room):
@@ -72,7 +63,7 @@ class TestPromptRoom:
         assert room.state == State.WAITING_TO_START
         assert room.round == 0
         assert len(room.players) == 0
-        assert len(room.prompts) == PromptRoom.ROUNDS
+        assert len(room._prompt_indices) == PromptRoom.ROUNDS
         assert isinstance(room.answers, dict)
         assert isinstance(room.votes, dict)
         assert isinstance(room.scores, dict)
@@ -82,7 +73,6 @@ class TestPromptRoom:
         result = room.add_player("alice")
         assert result is True
         assert "alice" in room.players
-        assert isinstance(room.players["alice"], Player)
     
     def test_add_player_duplicate_name(self, room):
         """Test adding player with existing name fails"""
@@ -128,7 +118,7 @@ class TestPromptRoom:
         """Test getting current prompt"""
         prompt = room.get_prompt()
         assert isinstance(prompt, str)
-        assert prompt in [p[0] for p in room.prompts]
+        assert prompt in [PromptRoom.PROMPTS[i][0] for i in room._prompt_indices]
     
     def test_submit_answer_collecting_state(self, room_with_players):
         """Test submitting answer during collecting phase"""
@@ -162,8 +152,21 @@ class TestPromptRoom:
         
         assert room_with_players.state == State.VOTING
         assert PromptRoom.CORRECT_KEY in room_with_players.answers
-        assert len(room_with_players.vote_orders) == 3
+        _, _, vote_options = room_with_players.get_vote_options()
+        assert len(vote_options) == 3
     
+    def test_late_joiner_counts_toward_answers(self, room_with_players):
+        """Test that a player joining after start is waited on before voting begins"""
+        room_with_players.start()
+        room_with_players.add_player("dave")
+
+        for player in ("dave", "alice", "bob"):
+            assert room_with_players.submit_data(player, {"answer": player}) == InteractReturnCodes.SUCCESS
+        assert room_with_players.state == State.COLLECTING_ANSWERS
+
+        assert room_with_players.submit_data("charlie", {"answer": "charlie"}) == InteractReturnCodes.SUCCESS
+        assert room_with_players.state == State.VOTING
+
     def test_submit_vote_success(self, room_with_players):
         """Test submitting vote during voting phase"""
         room_with_players.start()
@@ -174,7 +177,8 @@ class TestPromptRoom:
         room_with_players.submit_data("charlie", {"answer": "answer3"})
         
         # Now submit a vote
-        vote_target = room_with_players.vote_orders["alice"][0]
+        _, _, vote_options = room_with_players.get_vote_options()
+        vote_target = vote_options["alice"][0]["id"]
         result = room_with_players.submit_data("alice", {"voted_for_answer_id": vote_target})
         assert result == InteractReturnCodes.SUCCESS
         assert room_with_players.votes["alice"] == vote_target
@@ -323,8 +327,8 @@ class TestPromptRoom:
         room_with_players.submit_data("charlie", {"answer": "answer3"})
         
         # Alice votes
-        alice_options = room_with_players.vote_orders["alice"]
-        room_with_players.submit_data("alice", {"voted_for_answer_id": alice_options[0]})
+        _, _, vote_options = room_with_players.get_vote_options()
+        room_with_players.submit_data("alice", {"voted_for_answer_id": vote_options["alice"][0]["id"]})
         
         code, state, data = room_with_players.get_room_state("alice")
         assert code == InteractReturnCodes.SUCCESS
@@ -383,11 +387,12 @@ class TestPromptRoom:
         room_with_players.submit_data("bob", {"answer": "answer2"})
         room_with_players.submit_data("charlie", {"answer": "answer3"})
         
-        # Players vote - they need to vote for answer IDs from their vote_orders
+        # Players vote - they need to vote for answer IDs from their vote options
         # Get the actual vote order for each player to vote correctly
-        alice_options = room_with_players.vote_orders["alice"]
-        bob_options = room_with_players.vote_orders["bob"] 
-        charlie_options = room_with_players.vote_orders["charlie"]
+        _, _, vote_options = room_with_players.get_vote_options()
+        alice_options = [option["id"] for option in vote_options["alice"]]
+        bob_options = [option["id"] for option in vote_options["bob"]]
+        charlie_options = [option["id"] for option in vote_options["charlie"]]
         
         # Have bob and charlie vote for alice (if alice is in their options)
         alice_votes = 0
@@ -414,6 +419,22 @@ class TestPromptRoom:
         # Check that alice got the expected number of votes
         assert room_with_players.scores["alice"] == alice_votes
 
+    def test_results_polls_do_not_recount(self, room_with_players: PromptRoom):
+        """Test that polling results repeatedly doesn't add the votes again"""
+        room_with_players.start()
+
+        for name in ("alice", "bob", "charlie"):
+            room_with_players.submit_data(name, {"answer": name})
+        room_with_players.submit_data("alice", {"voted_for_answer_id": "bob"})
+        room_with_players.submit_data("bob", {"voted_for_answer_id": "alice"})
+        room_with_players.submit_data("charlie", {"voted_for_answer_id": "alice"})
+
+        for _ in range(3):
+            _, _, data = room_with_players.get_room_state("alice")
+        assert isinstance(data, list)
+        assert {r["user"]: r["score"] for r in data} == {"alice": 2, "bob": 1, "charlie": 0}
+        assert room_with_players.scores == {"alice": 2, "bob": 1, "charlie": 0}
+
 
 class TestGameGateway:
     """Test GameGateway class"""
@@ -446,6 +467,33 @@ class TestGameGateway:
         """Test joining non-existent room"""
         result = gateway.join_room("xxxx", "alice")
         assert result == JoinReturnCodes.ROOM_NOT_FOUND
+
+    def test_get_vote_options(self, gateway):
+        """Test getting every player's vote options in one call"""
+        room_id = gateway.new_game(PromptRoom)
+        for name in ("alice", "bob", "charlie"):
+            gateway.join_room(room_id, name)
+
+        code, _, options = gateway.get_vote_options(room_id)
+        assert code == InteractReturnCodes.WRONG_STATE
+
+        gateway.room_start(room_id)
+        for name in ("alice", "bob", "charlie"):
+            gateway.submit_data(room_id, name, {"answer": name})
+
+        code, prompt, options = gateway.get_vote_options(room_id)
+        assert code == InteractReturnCodes.SUCCESS
+        assert prompt == gateway.rooms[room_id].get_prompt()
+        assert set(options) == {"alice", "bob", "charlie"}
+        for name, answers in options.items():
+            assert answers == gateway.get_room_state(room_id, name)[2]["answers"]
+            assert name not in [a["id"] for a in answers]
+
+    def test_get_vote_options_room_not_found(self, gateway):
+        """Test getting vote options for non-existent room"""
+        code, _, options = gateway.get_vote_options("xxxx")
+        assert code == InteractReturnCodes.ROOM_NOT_FOUND
+        assert options == {}
     
     def test_join_room_name_in_use(self, gateway):
         """Test joining room with name already in use"""
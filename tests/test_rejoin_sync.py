@@ -11,6 +11,11 @@ from splash_club.connection_manager import ConnectionManager
 from splash_club.contracts import ReJoinRoomClientMessage
 
 
+def sent_frames(handler):
+    """Decode every frame sent through the mocked connection manager."""
+    return [json.loads(call[0][1]) for call in handler.connection_manager.safe_websocket_send.call_args_list]
+
+
 class TestRejoinGameStateSync:
     """Test suite for rejoin game state synchronization functionality."""
     
@@ -32,14 +37,13 @@ class TestRejoinGameStateSync:
         manager = MagicMock(spec=ConnectionManager)
         manager.register_user = AsyncMock()
         manager.safe_websocket_send = AsyncMock(return_value=True)
+        manager.get_user_update_frame.return_value = b'{"type":"user_update","users":["alice","bob","charlie"]}'
         return manager
     
     @pytest.fixture
     def rejoin_handler(self, connection_manager, game_gateway):
         """Create a ReJoinRoomHandler instance."""
-        handler = ReJoinRoomHandler(connection_manager, game_gateway)
-        handler.notify_room_users_updated = AsyncMock()
-        return handler
+        return ReJoinRoomHandler(connection_manager, game_gateway)
     
     @pytest.fixture
     def room_with_game_in_progress(self, game_gateway):
@@ -69,12 +73,10 @@ class TestRejoinGameStateSync:
         rejoin_handler.connection_manager.register_user.assert_called_once()
         rejoin_handler.connection_manager.safe_websocket_send.assert_called()
         
-        # Should send rejoin_room_ok but no additional game state messages for WAITING_TO_START
-        calls = rejoin_handler.connection_manager.safe_websocket_send.call_args_list
-        assert len(calls) == 1  # Only rejoin_room_ok message
-        
-        sent_message = json.loads(calls[0][0][1])
-        assert sent_message["type"] == "rejoin_room_ok"
+        # Should send rejoin_room_ok and the user list but no game state message for WAITING_TO_START
+        frames = sent_frames(rejoin_handler)
+        assert len(frames) == 1
+        assert [m["type"] for m in frames[0]] == ["rejoin_room_ok", "user_update"]
     
     @pytest.mark.asyncio
     async def test_rejoin_collecting_answers_state(self, rejoin_handler, mock_websocket, room_with_game_in_progress):
@@ -91,17 +93,12 @@ class TestRejoinGameStateSync:
         
         assert result is True
         
-        # Should send rejoin_room_ok + ask_prompt messages
-        calls = rejoin_handler.connection_manager.safe_websocket_send.call_args_list
-        assert len(calls) == 2
-        
-        # First message should be rejoin_room_ok
-        rejoin_message = json.loads(calls[0][0][1])
-        assert rejoin_message["type"] == "rejoin_room_ok"
+        # Should send rejoin_room_ok + user_update + ask_prompt in one frame
+        frames = sent_frames(rejoin_handler)
+        assert len(frames) == 1
+        assert [m["type"] for m in frames[0]] == ["rejoin_room_ok", "user_update", "ask_prompt"]
         
-        # Second message should be ask_prompt
-        prompt_message = json.loads(calls[1][0][1])
-        assert prompt_message["type"] == "ask_prompt"
+        prompt_message = frames[0][2]
         assert "prompt" in prompt_message
     
     @pytest.mark.asyncio
@@ -123,17 +120,12 @@ class TestRejoinGameStateSync:
         
         assert result is True
         
-        # Should send rejoin_room_ok + ask_vote messages
-        calls = rejoin_handler.connection_manager.safe_websocket_send.call_args_list
-        assert len(calls) == 2
+        # Should send rejoin_room_ok + user_update + ask_vote in one frame
+        frames = sent_frames(rejoin_handler)
+        assert len(frames) == 1
+        assert [m["type"] for m in frames[0]] == ["rejoin_room_ok", "user_update", "ask_vote"]
         
-        # First message should be rejoin_room_ok
-        rejoin_message = json.loads(calls[0][0][1])
-        assert rejoin_message["type"] == "rejoin_room_ok"
-        
-        # Second message should be ask_vote
-        vote_message = json.loads(calls[1][0][1])
-        assert vote_message["type"] == "ask_vote"
+        vote_message = frames[0][2]
         assert "prompt" in vote_message
         assert "answers" in vote_message
         assert isinstance(vote_message["answers"], list)
@@ -162,17 +154,12 @@ class TestRejoinGameStateSync:
         
         assert result is True
         
-        # Should send rejoin_room_ok + show_results messages
-        calls = rejoin_handler.connection_manager.safe_websocket_send.call_args_list
-        assert len(calls) == 2
-        
-        # First message should be rejoin_room_ok
-        rejoin_message = json.loads(calls[0][0][1])
-        assert rejoin_message["type"] == "rejoin_room_ok"
+        # Should send rejoin_room_ok + user_update + show_results in one frame
+        frames = sent_frames(rejoin_handler)
+        assert len(frames) == 1
+        assert [m["type"] for m in frames[0]] == ["rejoin_room_ok", "user_update", "show_results"]
         
-        # Second message should be show_results
-        results_message = json.loads(calls[1][0][1])
-        assert results_message["type"] == "show_results"
+        results_message = frames[0][2]
         assert "results" in results_message
         assert isinstance(results_message["results"], list)
     
@@ -225,16 +212,17 @@ class TestRejoinGameStateSync:
         room_id, room = room_with_game_in_progress
         room.start()
         
-        # Mock safe_websocket_send to raise exception on second call (sync message)
-        rejoin_handler.connection_manager.safe_websocket_send.side_effect = [True, Exception("Network error")]
-        
         message = ReJoinRoomClientMessage(room=room_id, user="alice")
         
-        # Should still return True because rejoin succeeded, even if sync failed
-        result = await rejoin_handler.handle(mock_websocket, message)
+        # Make building the sync message fail after the rejoin itself succeeded
+        with patch.object(rejoin_handler.game_gateway, "get_room_state", side_effect=Exception("State error")):
+            result = await rejoin_handler.handle(mock_websocket, message)
         
+        # Should still return True and send the ack and user list, just without a sync message
         assert result is True
         rejoin_handler.connection_manager.register_user.assert_called_once()
+        frames = sent_frames(rejoin_handler)
+        assert [m["type"] for m in frames[0]] == ["rejoin_room_ok", "user_update"]
 
     @pytest.mark.asyncio
     async def test_rejoin_collecting_answers_state_already_answered(self, rejoin_handler, mock_websocket, room_with_game_in_progress):
@@ -254,17 +242,12 @@ class TestRejoinGameStateSync:
         
         assert result is True
         
-        # Should send rejoin_room_ok + ask_prompt messages, with already_answered=true
-        calls = rejoin_handler.connection_manager.safe_websocket_send.call_args_list
-        assert len(calls) == 2
-        
-        # First message should be rejoin_room_ok
-        rejoin_message = json.loads(calls[0][0][1])
-        assert rejoin_message["type"] == "rejoin_room_ok"
+        # Should send rejoin_room_ok + user_update + ask_prompt, with already_answered=true
+        frames = sent_frames(rejoin_handler)
+        assert len(frames) == 1
+        assert [m["type"] for m in frames[0]] == ["rejoin_room_ok", "user_update", "ask_prompt"]
         
-        # Second message should be ask_prompt with already_answered=true
-        prompt_message = json.loads(calls[1][0][1])
-        assert prompt_message["type"] == "ask_prompt"
+        prompt_message = frames[0][2]
         assert prompt_message["already_answered"] is True
         assert "prompt" in prompt_message
 
@@ -290,13 +273,10 @@ class TestRejoinGameStateSync:
         
         assert result is True
         
-        # Should only send rejoin_room_ok message, not ask_vote since user already voted
-        calls = rejoin_handler.connection_manager.safe_websocket_send.call_args_list
-        assert len(calls) == 1
-        
-        # First message should be rejoin_room_ok
-        rejoin_message = json.loads(calls[0][0][1])
-        assert rejoin_message["type"] == "rejoin_room_ok"
+        # Should only send rejoin_room_ok and the user list, not ask_vote since user already voted
+        frames = sent_frames(rejoin_handler)
+        assert len(frames) == 1
+        assert [m["type"] for m in frames[0]] == ["rejoin_room_ok", "user_update"]
 
     @pytest.mark.asyncio
     async def test_rejoin_voting_state_different_user_not_voted(self, rejoin_handler, mock_websocket, room_with_game_in_progress):
@@ -321,17 +301,42 @@ class TestRejoinGameStateSync:
         
         assert result is True
         
-        # Should send rejoin_room_ok + ask_vote messages since bob hasn't voted
-        calls = rejoin_handler.connection_manager.safe_websocket_send.call_args_list
-        assert len(calls) == 2
-        
-        # First message should be rejoin_room_ok
-        rejoin_message = json.loads(calls[0][0][1])
-        assert rejoin_message["type"] == "rejoin_room_ok"
+        # Should send rejoin_room_ok + user_update + ask_vote in one frame since bob hasn't voted
+        frames = sent_frames(rejoin_handler)
+        assert len(frames) == 1
+        assert [m["type"] for m in frames[0]] == ["rejoin_room_ok", "user_update", "ask_vote"]
         
-        # Second message should be ask_vote
-        vote_message = json.loads(calls[1][0][1])
-        assert vote_message["type"] == "ask_vote"
+        vote_message = frames[0][2]
         assert "prompt" in vote_message
         assert "answers" in vote_message
-        assert isinstance(vote_message["answers"], list) 
\ No newline at end of file
+        assert isinstance(vote_message["answers"], list) 
+
+    @pytest.mark.asyncio
+    async def test_rejoin_frame_order_with_real_outbox(self, game_gateway, room_with_game_in_progress):
+        """Test that a rejoiner gets ack, user list and sync in one frame and others only the user list."""
+        room_id, room = room_with_game_in_progress
+        room.start()
+        
+        manager = ConnectionManager()
+        handler = ReJoinRoomHandler(manager, game_gateway)
+        alice, bob = AsyncMock(), AsyncMock()
+        alice.remote_address, bob.remote_address = ("127.0.0.1", 1), ("127.0.0.1", 2)
+        await manager.register_user(bob, room_id, "bob")
+        
+        result = await handler.handle(alice, ReJoinRoomClientMessage(room=room_id, user="alice"))
+        assert result is True
+        for _ in range(3):
+            await asyncio.sleep(0)
+        
+        # The rejoiner's frames arrive in order with nothing trailing the sync message
+        alice.send.assert_awaited_once()
+        alice_frame = json.loads(alice.send.call_args[0][0])
+        assert [m["type"] for m in alice_frame] == ["rejoin_room_ok", "user_update", "ask_prompt"]
+        assert alice_frame[1]["users"] == ["bob", "alice"]
+        
+        # Everyone else gets the deferred user list broadcast
+        bob.send.assert_awaited_once()
+        assert json.loads(bob.send.call_args[0][0])["type"] == "user_update"
+        
+        await manager.unregister_user(alice)
+        await manager.unregister_user(bob)